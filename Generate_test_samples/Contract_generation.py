@@ -1,13 +1,106 @@
-from docxtpl import DocxTemplate
-from contract_data import contract_data_list  # Import the list of dictionaries
-
-# Load the contract template
-template_path = "Contract_template.docx"
-template = DocxTemplate(template_path)
-
-# Loop through each dictionary and generate a contract with an indexed filename
-for index, contract_data in enumerate(contract_data_list):
-    template.render(contract_data)
-    output_filename = f"C:/Users/PAVILION/Desktop/Automated Contract Generation/generated_contracts/generated_contract_{index+1}.docx"  # Unique filename for each contract
-    template.save(output_filename)
-    print(f"Contract generated and saved as {output_filename}")
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import zipfile
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(script_dir))
+
+from pdf_converter import DEFAULT_PDF_WORKERS, ConverterUnavailable, PdfConverterPool  # noqa: E402
+from template_registry import render_many  # noqa: E402
+
+default_template_path = os.path.join(script_dir, "Contract_template.docx")
+default_output_path = os.path.join(os.path.dirname(script_dir), "generated_contracts")
+
+def load_contract_rows(input_path):
+    """Reads contract rows (dicts with the template's keys) from CSV, JSONL or Parquet."""
+    extension = os.path.splitext(input_path)[1].lower()
+    if extension == ".csv":
+        with open(input_path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif extension in (".jsonl", ".ndjson"):
+        with open(input_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == ".parquet":
+        import pandas as pd
+        df = pd.read_parquet(input_path).fillna("").astype(str)
+        yield from df.to_dict("records")
+    else:
+        raise ValueError(f"Unsupported input format: {extension} (expected .csv, .jsonl or .parquet)")
+
+
+def generate_contracts(contract_rows, template_path, output_path, workers=None, chunksize=16, pdf_converter=None):
+    """
+    Renders every row in parallel and writes the contracts to output_path,
+    which is either a directory or a .zip archive. With a
+    pdf_converter.PdfConverterPool the contracts are written as PDF.
+    Returns the number of contracts written.
+    """
+    to_zip = output_path.lower().endswith(".zip")
+    if to_zip:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        archive = zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED)
+    else:
+        os.makedirs(output_path, exist_ok=True)
+        archive = None
+
+    count = 0
+    try:
+        contents = (content for _, content in render_many(contract_rows, template_path, workers, chunksize))
+        extension = "docx"
+        if pdf_converter is not None:
+            contents = pdf_converter.convert_many(contents)
+            extension = "pdf"
+        for index, content in enumerate(contents):
+            file_name = f"generated_contract_{index + 1}.{extension}"
+            if archive is not None:
+                archive.writestr(file_name, content)
+            else:
+                with open(os.path.join(output_path, file_name), "wb") as f:
+                    f.write(content)
+            count += 1
+    finally:
+        if archive is not None:
+            archive.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate contracts in bulk from a template.")
+    parser.add_argument("--input", help="CSV, JSONL or Parquet file of contract rows (defaults to contract_data.py samples)")
+    parser.add_argument("--template", default=default_template_path, help="DOCX template to render")
+    parser.add_argument("--output", default=default_output_path, help="Output directory, or a .zip file to write into")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (defaults to CPU count)")
+    parser.add_argument("--chunksize", type=int, default=16, help="Rows sent to a worker at a time")
+    parser.add_argument("--pdf", action="store_true", help="Write PDF instead of DOCX (needs LibreOffice)")
+    parser.add_argument("--pdf-workers", type=int, default=DEFAULT_PDF_WORKERS, help="Number of LibreOffice processes for PDF conversion")
+    args = parser.parse_args()
+
+    if args.input:
+        contract_rows = load_contract_rows(args.input)
+    else:
+        from contract_data import contract_data_list  # Import the list of dictionaries
+        contract_rows = contract_data_list
+
+    start = time.perf_counter()
+    if args.pdf:
+        try:
+            pdf_converter = PdfConverterPool(args.pdf_workers)
+        except ConverterUnavailable as e:
+            sys.exit(f"PDF output is not available: {e}")
+        with pdf_converter:
+            count = generate_contracts(contract_rows, args.template, args.output, args.workers, args.chunksize, pdf_converter)
+    else:
+        count = generate_contracts(contract_rows, args.template, args.output, args.workers, args.chunksize)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Generated {count} contracts into {args.output} in {elapsed:.2f}s ({rate:.1f} docs/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,113 +1,385 @@
 import streamlit as st
-from docxtpl import DocxTemplate
-from pathlib import Path
+import matplotlib.pyplot as plt
+from datetime import date
 from io import BytesIO
+from pathlib import Path
 import os
-from contract_loader import extract_contract_data
-from validation_checks import check_completeness, validate_contract_data
+import hashlib
+import tempfile
+import time
+import zipfile
+import pandas as pd
+from contract_dedup import find_near_duplicates
+from contract_diff import deviation_report
+from contract_index import ContractIndex
+from contract_insights import build_insights_frame, stream_insights, summarize_insights
+from contract_loader import extract_many, iter_docx_members, read_contract_file
+from contract_search import ContractSearchIndex
+from extraction_cache import ExtractionCache
+from instrumentation import ExtractionProfiler
+from pdf_converter import ConverterUnavailable, PdfConverterPool
+from template_registry import TemplateRegistry, render_many
+from validation_checks import check_completeness, issue_messages, validate_contracts
 
 # Define template path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 template_path = os.path.join(current_dir, "templates", "Contract_template.docx")
 
-# Add debug information at the start
-st.write("Current working directory:", os.getcwd())
-st.write("Files in current directory:", os.listdir())
-if os.path.exists("templates"):
-    st.write("Files in templates directory:", os.listdir("templates"))
+# One extraction cache per process, shared by all sessions; it keeps the text for the search index
+@st.cache_resource
+def get_extraction_cache():
+    return ExtractionCache(store_text=True)
+
+# One template registry per process, so templates are parsed once for all sessions
+@st.cache_resource
+def get_template_registry():
+    return TemplateRegistry()
+
+# Warm LibreOffice processes for PDF output, started on first use and shared by all sessions
+@st.cache_resource
+def get_pdf_converter():
+    return PdfConverterPool()
+
+# Persistent index of every contract extracted on the insights page
+@st.cache_resource
+def get_contract_index():
+    return ContractIndex()
+
+# Full-text search index, filled alongside the contract index
+@st.cache_resource
+def get_search_index():
+    return ContractSearchIndex()
+
+# Keys of the contract template, in form order
+CONTRACT_FIELDS = [
+    "contract_date", "service_provider", "provider_address", "provider_email", "client_name", "client_address",
+    "client_email", "service_description", "payment_amount", "payment_terms", "start_date", "end_date",
+    "termination_conditions", "governing_law",
+]
+
+# Columns the insights dashboard reads from the index
+INSIGHTS_COLUMNS = ["Service Provider", "Client Name", "Governing Law", "Start Date", "End Date", "Contract Date"]
+
+# Contracts extracted and aggregated at a time in streaming mode
+STREAM_BATCH_SIZE = 500
 
-# Function to load and process contract data
-def load_contract_data(files):
-    contract_data_list = []
+# Fields that get their own filter box on the search page
+SEARCH_FILTER_FIELDS = ["Service Provider", "Client Name", "Governing Law"]
+
+# Shows the stage timings collected by an ExtractionProfiler
+def show_timings_panel(profiler):
+    payload = profiler.log_summary()
+    with st.expander("Extraction timings"):
+        stages = [
+            {"Stage": stage, **{key: value for key, value in stats.items() if key != "histogram"}}
+            for stage, stats in payload["stages"].items()
+        ]
+        st.dataframe(stages)
+        st.write("Histogram (documents per time bucket)")
+        st.dataframe([{"Stage": stage, **stats["histogram"]} for stage, stats in payload["stages"].items()])
+        if payload["slow_documents"]:
+            st.warning(f"{len(payload['slow_documents'])} contract(s) exceeded the {payload['budget_ms']:.0f} ms budget")
+            st.dataframe(payload["slow_documents"])
+
+def _excel_cell_text(value):
+    if pd.isna(value):
+        return ""
+    # Excel stores dates as dates; write them the way the template expects
+    if isinstance(value, date):
+        return value.strftime("%B %d, %Y")
+    return str(value)
+
+# Reads contract rows from an uploaded CSV or Excel file as dicts of strings
+def load_generation_rows(uploaded_file):
+    if uploaded_file.name.lower().endswith(".csv"):
+        df = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    else:
+        # Cell by cell, so a number column with empty cells is not turned into floats ("5000.0")
+        df = pd.read_excel(uploaded_file, dtype=object)
+        df = df.apply(lambda column: column.map(_excel_cell_text))
+    return df.to_dict("records"), [field for field in CONTRACT_FIELDS if field not in df.columns]
+
+# Renders rows in parallel straight into a zip on disk, so rendered contracts never pile up in memory
+def generate_contracts_zip(rows, archive_file, progress, pdf_converter=None):
+    contents = (content for _, content in render_many(rows, template_path))
+    extension = "docx"
+    if pdf_converter is not None:
+        contents = pdf_converter.convert_many(contents)
+        extension = "pdf"
+    with zipfile.ZipFile(archive_file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, content in enumerate(contents):
+            archive.writestr(f"generated_contract_{index + 1}.{extension}", content)
+            progress.progress((index + 1) / len(rows), text=f"Rendered {index + 1} of {len(rows)} contracts")
+    archive_file.seek(0)
+
+# Extracts uploaded contracts in parallel, returning [(contract_data, contract_text, error)] and the diagnostics
+def extract_uploads(file_names, contents, profiler=None):
+    extraction_diagnostics = {}
+    results = extract_many(contents, cache=get_extraction_cache(), profiler=profiler, names=file_names,
+                           guarded=True, diagnostics=extraction_diagnostics)
+    return results, extraction_diagnostics
+
+# Memoized on the uploads' content hashes, so reruns reuse the results; the bytes themselves are not hashed
+@st.cache_data(show_spinner="Extracting contracts...", max_entries=64)
+def extract_uploads_cached(content_keys, file_names, _contents):
+    return extract_uploads(list(file_names), _contents)
+
+def collect_uploads(file_names, contents, profiler=None):
+    content_keys = tuple(hashlib.sha256(content).hexdigest() for content in contents)
+    if profiler is not None:
+        # Timings are only meaningful for a real extraction, so skip the memo
+        extracted, extraction_diagnostics = extract_uploads(file_names, contents, profiler)
+    else:
+        extracted, extraction_diagnostics = extract_uploads_cached(content_keys, tuple(file_names), contents)
+    for file_name, messages in extraction_diagnostics.items():
+        st.warning(f"{file_name}: some fields could not be extracted in time ({'; '.join(messages)})")
+    return content_keys, extracted
+
+# Validation issues of extracted contracts, grouped by category
+def collect_issues(file_names, extracted, profiler=None):
+    issues = {
+        "Missing Fields": [],
+        "Date Problems": [],
+        "Expiring Soon": [],
+        "Expired": [],
+        "Complete and Valid": [],
+        "Missing Information": []
+    }
+    valid_names = []
+    valid_data = []
+    for file_name, (contract_data, _, error) in zip(file_names, extracted):
+        if error:
+            issues.setdefault("Error", []).append(f"{file_name}: {error}")
+        else:
+            valid_names.append(file_name)
+            valid_data.append(contract_data)
+    if not valid_data:
+        return issues
 
-    for file in files:
-        contract_data, _ = extract_contract_data(file)
-        contract_data_list.append(contract_data)
+    # Validate all contracts in one vectorized pass
+    start = time.perf_counter()
+    validation_table = validate_contracts(valid_data)
+    if profiler is not None:
+        # One batch for all contracts, so each is charged an equal share
+        share = (time.perf_counter() - start) / len(valid_data)
+        for file_name in valid_names:
+            profiler.record(file_name, {"validate": share})
 
-    df = pd.DataFrame(contract_data_list)
+    for file_name, (_, issues_row) in zip(valid_names, validation_table.iterrows()):
+        for category, issue_list in issue_messages(issues_row).items():
+            issues.setdefault(category, []).extend(f"{file_name}: {issue}" for issue in issue_list)
+    return issues
 
-    # Ensure date columns are in datetime format
-    df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
-    df['End Date'] = pd.to_datetime(df['End Date'], errors='coerce')
-    df['Contract Date'] = pd.to_datetime(df['Contract Date'], errors='coerce')
+# Expiry depends on the date, so it is part of the key
+@st.cache_data(show_spinner=False, max_entries=64)
+def collect_issues_cached(content_keys, file_names, today, _extracted):
+    return collect_issues(file_names, _extracted)
 
-    # Calculate contract length in days
-    df['Contract Length'] = (df['End Date'] - df['Start Date']).dt.days
+# Boilerplate that differs from the template, one row per deviation
+@st.cache_data(show_spinner=False, max_entries=64)
+def deviations_for_uploads(content_keys, file_names, _contract_texts):
+    return deviation_report(file_names, _contract_texts, template_path)
 
-    return df
+# Appends a set of uploads to the indexes once, rather than on every rerun
+@st.cache_data(show_spinner=False, max_entries=64)
+def index_uploads(content_keys, _contract_data_list, _contract_texts):
+    get_search_index().add(
+        (contract_data["Content Key"], contract_data["File Name"], contract_data, contract_text)
+        for contract_data, contract_text in zip(_contract_data_list, _contract_texts)
+    )
+    return get_contract_index().append(_contract_data_list)
+
+# Insights summary, memoized on the contracts' content hashes and the day it was computed
+@st.cache_data(show_spinner=False, max_entries=64)
+def insights_for_uploads(content_keys, today, _contract_data_list):
+    return summarize_insights(build_insights_frame(_contract_data_list, today=today))
+
+# Groups of near-duplicate uploads as lists of file names; contracts without text are left out
+@st.cache_data(show_spinner=False, max_entries=64)
+def near_duplicates_for_uploads(content_keys, file_names, _contract_texts):
+    groups = find_near_duplicates(range(len(file_names)), _contract_texts)
+    return [[file_names[index] for index in group] for group in groups]
+
+# The index version changes with every write, including the directory watcher's
+@st.cache_data(show_spinner="Loading indexed contracts...", max_entries=8)
+def insights_for_archive(index_version, today):
+    return summarize_insights(build_insights_frame(get_contract_index().load(columns=INSIGHTS_COLUMNS), today=today))
+
+# Yields (name, bytes) for every uploaded contract, reading zip members one at a time
+def iter_upload_contracts(uploaded_files):
+    for uploaded_file in uploaded_files:
+        if uploaded_file.type == "application/zip":
+            yield from iter_docx_members(uploaded_file)
+        else:
+            yield uploaded_file.name, uploaded_file.getvalue()
+
+# Extracts, indexes and aggregates the uploads one batch at a time, so memory does not grow with the archive
+def stream_upload_insights(uploaded_files, today, include_archive, status):
+    return stream_insights(
+        iter_upload_contracts(uploaded_files),
+        get_contract_index(),
+        search_index=get_search_index(),
+        cache=get_extraction_cache(),
+        today=today,
+        include_archive=include_archive,
+        columns=INSIGHTS_COLUMNS,
+        batch_size=STREAM_BATCH_SIZE,
+        progress=lambda processed: status.write(f"Processed {processed} contracts..."),
+    )
+
+def _figure_png(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+# The three dashboard charts as PNG images, redrawn only when the data behind them changes
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_insight_charts(status_counts, length_histogram, overview_counts):
+    charts = []
+
+    # Number of contracts by status
+    fig, ax = plt.subplots()
+    ax.bar(status_counts.index.astype(str), status_counts.values)
+    ax.set_title("Number of Contracts by Status")
+    ax.set_xlabel("Status")
+    ax.set_ylabel("Count")
+    charts.append(_figure_png(fig))
+
+    # Drawn from the binned counts, so the lengths themselves are not needed
+    edges, counts = length_histogram
+    fig, ax = plt.subplots()
+    ax.hist(edges[:-1], bins=edges, weights=counts, color='skyblue', edgecolor='black')
+    ax.set_title("Distribution of Contract Length")
+    ax.set_xlabel("Contract Length (days)")
+    ax.set_ylabel("Frequency")
+    charts.append(_figure_png(fig))
+
+    # Contracts overview pie chart with legend
+    fig, ax = plt.subplots()
+    labels = ['Active Contracts', 'Expiring Soon', 'Contracts with Issues']
+    colors = ['#66c2a5', '#fc8d62', '#8da0cb']
+    wedges, texts, autotexts = ax.pie(overview_counts, labels=labels, autopct='%1.1f%%', colors=colors)
+    ax.legend(wedges, labels, title="Contract Status", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+    ax.set_title("Contracts Overview")
+    charts.append(_figure_png(fig))
+
+    return charts
 
 # Sidebar with three options
 st.sidebar.title("Options")
-option = st.sidebar.radio("Select an option:", ("Generate Contract", "Check Contract", "Contract Insights"))
+option = st.sidebar.radio("Select an option:", ("Generate Contract", "Check Contract", "Contract Insights", "Search Contracts"))
+
+# Opt-in timing of extraction and validation
+record_timings = st.sidebar.checkbox("Record extraction timings")
+if record_timings:
+    budget_ms = st.sidebar.number_input("Time budget per contract (ms)", min_value=1, value=500)
 
 if option == "Generate Contract":
     st.title("Contract Generator")
-    st.write("Fill in the contract details below:")
-
-    contract_date = st.date_input("Contract Date").strftime("%B %d, %Y")
-    service_provider = st.text_input("Service Provider")
-    provider_address = st.text_input("Provider Address")
-    provider_email = st.text_input("Provider Email")
-    client_name = st.text_input("Client Name")
-    client_address = st.text_input("Client Address")
-    client_email = st.text_input("Client Email")
-    service_description = st.text_area("Service Description")
-    payment_amount = st.text_input("Payment Amount")
-    payment_terms = st.text_area("Payment Terms")
-    start_date = st.date_input("Start Date").strftime("%B %d, %Y")
-    end_date = st.date_input("End Date").strftime("%B %d, %Y")
-    termination_conditions = st.text_area("Termination Conditions")
-    governing_law = st.text_input("Governing Law")
-
-    if st.button("Generate Contract"):
-        contract_data = {
-            "contract_date": contract_date,
-            "service_provider": service_provider,
-            "provider_address": provider_address,
-            "provider_email": provider_email,
-            "client_name": client_name,
-            "client_address": client_address,
-            "client_email": client_email,
-            "service_description": service_description,
-            "payment_amount": payment_amount,
-            "payment_terms": payment_terms,
-            "start_date": start_date,
-            "end_date": end_date,
-            "termination_conditions": termination_conditions,
-            "governing_law": governing_law
-        }
+    generation_mode = st.radio("Generate:", ("A single contract", "A batch from a CSV or Excel file"), horizontal=True)
+    output_format = st.radio("Format:", ("DOCX", "PDF"), horizontal=True)
 
-        try:
-            # Debug information
-            st.write(f"Template path: {template_path}")
-            st.write(f"Template exists: {os.path.exists(template_path)}")
-            st.write(f"Template is file: {os.path.isfile(template_path)}")
-            
-            # Check if template exists
-            if not os.path.exists(template_path):
-                st.error(f"Template not found at: {template_path}")
-                st.stop()
-            
-            # Load template
-            doc = DocxTemplate(template_path)
+    if generation_mode == "A batch from a CSV or Excel file":
+        st.write(f"Upload one row per contract, with the columns {', '.join(CONTRACT_FIELDS)}.")
+        rows_file = st.file_uploader("Contract rows", type=["csv", "xlsx"])
+
+        if rows_file and st.button("Generate Contracts"):
+            try:
+                rows, missing_columns = load_generation_rows(rows_file)
+                if missing_columns:
+                    st.error(f"Missing columns: {', '.join(missing_columns)}")
+                    st.stop()
+                if not rows:
+                    st.error("The file has no rows.")
+                    st.stop()
+                if not os.path.exists(template_path):
+                    st.error(f"Template not found at: {template_path}")
+                    st.stop()
+
+                pdf_converter = get_pdf_converter() if output_format == "PDF" else None
+                progress = st.progress(0.0, text=f"Rendering {len(rows)} contracts...")
+                with tempfile.TemporaryFile() as archive_file:
+                    generate_contracts_zip(rows, archive_file, progress, pdf_converter)
+                    st.download_button(
+                        label="Download Contracts (.zip)",
+                        data=archive_file,
+                        file_name="generated_contracts.zip",
+                        mime="application/zip"
+                    )
+            except ConverterUnavailable as e:
+                st.error(f"PDF output is not available: {str(e)}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+    else:
+        st.write("Fill in the contract details below:")
+
+        contract_date = st.date_input("Contract Date").strftime("%B %d, %Y")
+        service_provider = st.text_input("Service Provider")
+        provider_address = st.text_input("Provider Address")
+        provider_email = st.text_input("Provider Email")
+        client_name = st.text_input("Client Name")
+        client_address = st.text_input("Client Address")
+        client_email = st.text_input("Client Email")
+        service_description = st.text_area("Service Description")
+        payment_amount = st.text_input("Payment Amount")
+        payment_terms = st.text_area("Payment Terms")
+        start_date = st.date_input("Start Date").strftime("%B %d, %Y")
+        end_date = st.date_input("End Date").strftime("%B %d, %Y")
+        termination_conditions = st.text_area("Termination Conditions")
+        governing_law = st.text_input("Governing Law")
+
+        if st.button("Generate Contract"):
+            contract_data = {
+                "contract_date": contract_date,
+                "service_provider": service_provider,
+                "provider_address": provider_address,
+                "provider_email": provider_email,
+                "client_name": client_name,
+                "client_address": client_address,
+                "client_email": client_email,
+                "service_description": service_description,
+                "payment_amount": payment_amount,
+                "payment_terms": payment_terms,
+                "start_date": start_date,
+                "end_date": end_date,
+                "termination_conditions": termination_conditions,
+                "governing_law": governing_law
+            }
+
+            try:
+                # Debug information
+                st.write(f"Template path: {template_path}")
+                st.write(f"Template exists: {os.path.exists(template_path)}")
+                st.write(f"Template is file: {os.path.isfile(template_path)}")
             
-            # Rest of your code remains the same
-            contract_data["start_date"] = contract_data["start_date"].strftime("%Y-%m-%d")
-            contract_data["end_date"] = contract_data["end_date"].strftime("%Y-%m-%d")
-            doc.render(contract_data)
+                # Check if template exists
+                if not os.path.exists(template_path):
+                    st.error(f"Template not found at: {template_path}")
+                    st.stop()
             
-            doc_io = BytesIO()
-            doc.save(doc_io)
-            doc_io.seek(0)
+                # Render from the cached template
+                doc_io = get_template_registry().render(template_path, contract_data)
             
-            st.download_button(
-                label="Download Contract",
-                data=doc_io,
-                file_name="generated_contract.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
+                if output_format == "PDF":
+                    st.download_button(
+                        label="Download Contract",
+                        data=get_pdf_converter().convert(doc_io),
+                        file_name="generated_contract.pdf",
+                        mime="application/pdf"
+                    )
+                else:
+                    st.download_button(
+                        label="Download Contract",
+                        data=doc_io,
+                        file_name="generated_contract.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    )
+            except ConverterUnavailable as e:
+                st.error(f"PDF output is not available: {str(e)}")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
 
 # Contract Checker
 elif option == "Check Contract":
@@ -115,29 +387,23 @@ elif option == "Check Contract":
     uploaded_files = st.file_uploader("Upload contracts for checking", type=["docx"], accept_multiple_files=True)
     
     if uploaded_files:
+        # Keep showing the results on later reruns; the memos make them cheap to rebuild
         if st.button("Check Contract"):
+            st.session_state["check_requested"] = True
+
+        if st.session_state.get("check_requested"):
             try:
-                # Initialize issues dictionary
-                issues = {
-                    "Missing Fields": [],
-                    "Date Problems": [],
-                    "Expiring Soon": [],
-                    "Complete and Valid": [],
-                    "Missing Information": []
-                }
-                
-                for uploaded_file in uploaded_files:
-                    # Extract and validate contract data
-                    contract_data = extract_contract_data(uploaded_file)
-                    validation_issues = validate_contract_data(contract_data)
-                    
-                    # Merge validation issues
-                    if validation_issues and validation_issues != {"Complete and Valid": ["Contract is complete and valid."]}:
-                        for category, issue_list in validation_issues.items():
-                            if category not in issues:
-                                issues[category] = []
-                            issues[category].extend(issue_list)
-                
+                profiler = ExtractionProfiler(budget_s=budget_ms / 1000) if record_timings else None
+                file_names = [uploaded_file.name for uploaded_file in uploaded_files]
+                contents = [uploaded_file.getvalue() for uploaded_file in uploaded_files]
+
+                # Extract all uploaded contracts in parallel
+                content_keys, extracted = collect_uploads(file_names, contents, profiler)
+                if profiler is not None:
+                    issues = collect_issues(file_names, extracted, profiler)
+                else:
+                    issues = collect_issues_cached(content_keys, tuple(file_names), date.today(), extracted)
+
                 # Display results
                 if issues:
                     for category, category_issues in issues.items():
@@ -147,7 +413,23 @@ elif option == "Check Contract":
                                 st.write(f"- {issue}")
                 else:
                     st.success("Contract validation passed successfully!")
-                    
+
+                # Texts of extractions cached without their text are read again
+                compared = [
+                    (file_name, contract_text if contract_text is not None else read_contract_file(BytesIO(content)))
+                    for file_name, content, (_, contract_text, error) in zip(file_names, contents, extracted)
+                    if not error
+                ]
+                deviations = deviations_for_uploads(
+                    content_keys, tuple(file_name for file_name, _ in compared), [text for _, text in compared]
+                )
+                if not deviations.empty:
+                    st.subheader("Template Deviations")
+                    st.dataframe(deviations, use_container_width=True)
+
+                if profiler is not None:
+                    show_timings_panel(profiler)
+
             except Exception as e:
                 st.error(f"Error checking contract: {str(e)}")
 
@@ -158,77 +440,138 @@ elif option == "Contract Insights":
 
     uploaded_files = st.file_uploader("Upload contract file(s) or a zip folder containing contracts:", type=["docx", "zip"], accept_multiple_files=True)
 
+    include_archive = st.checkbox("Include all previously indexed contracts")
+    stream_uploads = st.checkbox("Streaming mode for large archives (uses little memory; no near-duplicate report)")
+
+    # Keep the dashboard on later reruns; only work whose inputs changed is redone
     if st.button("Generate Insights"):
-        if uploaded_files:
-            contract_data_list = []
-
-            for uploaded_file in uploaded_files:
-                if uploaded_file.type == "application/zip":
-                    st.write("Extracting and processing contracts from the uploaded zip folder...")
-
-                    with zipfile.ZipFile(BytesIO(uploaded_file.getbuffer()), 'r') as zip_ref:
-                        zip_ref.extractall("temp_contracts")
-                    for file_name in os.listdir("temp_contracts"):
-                        if file_name.endswith(".docx"):
-                            file_path = os.path.join("temp_contracts", file_name)
-                            contract_data, _ = extract_contract_data(file_path)
-                            contract_data["File Name"] = file_name
-                            contract_data_list.append(contract_data)
-                else:
-                    st.write(f"Processing the uploaded contract file: {uploaded_file.name}")
-                    file_path = os.path.join("temp_contracts", uploaded_file.name)
-                    os.makedirs("temp_contracts", exist_ok=True)
-                    with open(file_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    contract_data, _ = extract_contract_data(file_path)
-                    contract_data["File Name"] = uploaded_file.name
+        st.session_state["insights_requested"] = True
+
+    if st.session_state.get("insights_requested"):
+        if uploaded_files or include_archive:
+            today = date.today()
+            duplicate_groups = None
+
+            if stream_uploads:
+                # Nothing per contract is kept between reruns, so the summary itself is remembered.
+                # Every upload gets a new file_id, so re-uploading a changed file with the same name
+                # and size is redone, as is a summary over an archive that has been written to since
+                stream_key = (tuple(uploaded_file.file_id for uploaded_file in uploaded_files or []),
+                              get_contract_index().version() if include_archive else None, today)
+                if st.session_state.get("streamed_insights_key") != stream_key:
+                    summary, failed = stream_upload_insights(uploaded_files or [], today, include_archive, st.empty())
+                    st.session_state["streamed_insights"] = (summary, failed)
+                    st.session_state["streamed_insights_key"] = stream_key
+                summary, failed = st.session_state["streamed_insights"]
+                if failed:
+                    shown = ", ".join(failed[:10]) + (", ..." if len(failed) > 10 else "")
+                    st.warning(f"Could not process {len(failed)} contract(s): {shown}")
+            else:
+                file_names = []
+                contents = []
+
+                for uploaded_file in uploaded_files or []:
+                    if uploaded_file.type == "application/zip":
+                        st.write("Extracting and processing contracts from the uploaded zip folder...")
+
+                        # Read each contract straight out of the archive, nothing is written to disk
+                        for member_name, content in iter_docx_members(uploaded_file):
+                            file_names.append(member_name)
+                            contents.append(content)
+                    else:
+                        st.write(f"Processing the uploaded contract file: {uploaded_file.name}")
+                        file_names.append(uploaded_file.name)
+                        contents.append(uploaded_file.getvalue())
+
+                # Extract all collected contracts in parallel
+                profiler = ExtractionProfiler(budget_s=budget_ms / 1000) if record_timings else None
+                content_keys, extracted = collect_uploads(file_names, contents, profiler)
+                contract_data_list = []
+                contract_texts = []
+                for file_name, content_key, (contract_data, contract_text, error) in zip(file_names, content_keys, extracted):
+                    if error:
+                        st.warning(f"Could not process {file_name}: {error}")
+                        continue
+                    contract_data["File Name"] = file_name
+                    contract_data["Content Key"] = content_key
                     contract_data_list.append(contract_data)
+                    contract_texts.append(contract_text)
+                if profiler is not None:
+                    show_timings_panel(profiler)
 
-            df = pd.DataFrame(contract_data_list)
-            df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
-            df['End Date'] = pd.to_datetime(df['End Date'], errors='coerce')
-            df['Contract Date'] = pd.to_datetime(df['Contract Date'], errors='coerce')
-            today = datetime.today()
-            df['Contract Length'] = (df['End Date'] - df['Start Date']).dt.days
-            df['Status'] = df['End Date'].apply(lambda x: 'Expired' if x < today else ('Expiring Soon' if x <= today + pd.DateOffset(days=30) else 'Active'))
+                # Add new contracts to the persistent and search indexes
+                index_uploads(content_keys, contract_data_list, contract_texts)
+
+                if include_archive:
+                    # The uploads are in the index now, so the archive covers them too
+                    summary = insights_for_archive(get_contract_index().version(), today)
+                else:
+                    summary = insights_for_uploads(content_keys, today, contract_data_list)
 
-            contracts_with_issues = df[(df[['Start Date', 'End Date', 'Service Provider', 'Client Name']].isnull().any(axis=1))]
-            good_contracts = df[df['Status'] == 'Active']
-            expiring_contracts = df[df['Status'] == 'Expiring Soon']
+                # Re-issued copies of the same contract, e.g. with another date or amount
+                duplicate_groups = near_duplicates_for_uploads(
+                    tuple(contract_data["Content Key"] for contract_data in contract_data_list),
+                    tuple(contract_data["File Name"] for contract_data in contract_data_list),
+                    contract_texts,
+                )
+
+            cache_stats = get_extraction_cache().stats()
+            st.caption(f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} stored contracts")
 
             st.write("### Statistics")
-            st.write(f"Total Contracts: {len(df)}")
-            st.write(f"Active Contracts: {len(good_contracts)}")
-            st.write(f"Expiring Contracts: {len(expiring_contracts)}")
-            st.write(f"Contracts with Issues: {len(contracts_with_issues)}")
-            st.write(f"Average Contract Length: {df['Contract Length'].mean():.2f} days")
+            st.write(f"Total Contracts: {summary['total']}")
+            st.write(f"Active Contracts: {summary['active']}")
+            st.write(f"Expiring Contracts: {summary['expiring']}")
+            st.write(f"Contracts with Issues: {summary['with_issues']}")
+            st.write(f"Average Contract Length: {summary['average_length']:.2f} days")
 
-            st.write("### Visualizations")
+            if duplicate_groups is not None:
+                st.write(f"Near-Duplicate Contracts: {sum(len(group) - 1 for group in duplicate_groups)}")
+                if duplicate_groups:
+                    with st.expander("Near-duplicate groups"):
+                        st.dataframe([
+                            {"Group": number, "Contracts": ", ".join(group)}
+                            for number, group in enumerate(duplicate_groups, start=1)
+                        ])
 
-            # Number of contracts by status
-            fig, ax = plt.subplots()
-            status_counts = df['Status'].value_counts()
-            ax.bar(status_counts.index, status_counts.values)
-            ax.set_title("Number of Contracts by Status")
-            ax.set_xlabel("Status")
-            ax.set_ylabel("Count")
-            st.pyplot(fig)
-
-            fig, ax = plt.subplots()
-            ax.hist(df['Contract Length'], bins=20, color='skyblue', edgecolor='black')
-            ax.set_title("Distribution of Contract Length")
-            ax.set_xlabel("Contract Length (days)")
-            ax.set_ylabel("Frequency")
-            st.pyplot(fig)
-
-            # Contracts overview pie chart with legend
-            fig, ax = plt.subplots()
-            issue_counts = [len(good_contracts), len(expiring_contracts), len(contracts_with_issues)]
-            labels = ['Active Contracts', 'Expiring Soon', 'Contracts with Issues']
-            colors = ['#66c2a5', '#fc8d62', '#8da0cb']
-            wedges, texts, autotexts = ax.pie(issue_counts, labels=labels, autopct='%1.1f%%', colors=colors)
-            ax.legend(wedges, labels, title="Contract Status", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-            ax.set_title("Contracts Overview")
-            st.pyplot(fig)
+            st.write("### Visualizations")
+            overview_counts = (summary['active'], summary['expiring'], summary['with_issues'])
+            for chart in render_insight_charts(summary['status_counts'], summary['length_histogram'], overview_counts):
+                st.image(chart)
         else:
             st.error("Please upload a contract file, multiple contract files, or a zip folder containing contracts.")
+
+# Contract Search
+elif option == "Search Contracts":
+    st.title("Contract Search")
+    search_index = get_search_index()
+    st.write(f"Search the {len(search_index)} contracts indexed on the insights page or by the directory watcher.")
+
+    query = st.text_input("Search text", placeholder="e.g. termination notice")
+    raw_query = st.checkbox("Advanced query syntax (phrases in quotes, OR, NOT, NEAR, field:word)")
+    filter_columns = st.columns(len(SEARCH_FILTER_FIELDS))
+    field_filters = {
+        field: column.text_input(field) for field, column in zip(SEARCH_FILTER_FIELDS, filter_columns)
+    }
+    filter_end_date = st.checkbox("Filter by end date")
+    end_from = end_to = None
+    if filter_end_date:
+        from_column, to_column = st.columns(2)
+        end_from = from_column.date_input("Ends on or after")
+        end_to = to_column.date_input("Ends on or before")
+    limit = st.number_input("Maximum results", min_value=1, max_value=1000, value=50)
+
+    if query.strip() or any(value.strip() for value in field_filters.values()) or filter_end_date:
+        try:
+            start = time.perf_counter()
+            results = search_index.search(query, fields=field_filters, end_from=end_from, end_to=end_to,
+                                          limit=int(limit), raw=raw_query)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            st.caption(f"{len(results)} result(s) in {elapsed_ms:.0f} ms")
+            if results:
+                columns = ["File Name", *SEARCH_FILTER_FIELDS, "Start Date", "End Date"]
+                if query.strip():
+                    columns.append("Snippet")
+                st.dataframe(pd.DataFrame(results, columns=columns), use_container_width=True)
+        except Exception as e:
+            st.error(f"Error searching contracts: {str(e)}")
@@ -0,0 +1,110 @@
+import argparse
+import os
+import random
+import sys
+import time
+from io import BytesIO
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, benchmarks_dir)
+
+from synthetic_corpus import generate_corpus  # noqa: E402  (also puts the repo on sys.path)
+
+from contract_loader import (  # noqa: E402
+    DEFAULT_FIELD_BUDGET_S,
+    FIELD_NAMES,
+    extract_fields_guarded,
+    read_contract_file,
+)
+
+# Markers the field patterns anchor on; repeating them drives backtracking
+markers = [
+    "Service Provider:",
+    "Address:",
+    "Contact Email:",
+    "Client:",
+    "amount of",
+    "payment schedule:",
+    "conditions:",
+    "1. Services Provided",
+    "2. Payment Terms",
+    "4. Termination",
+    "6. Governing Law",
+    "\n3.",
+    "\n5.",
+    "@",
+]
+
+
+def adversarial_texts(size):
+    """Yields (name, text) pairs built to trigger the worst cases of the field patterns."""
+    yield "provider_whitespace", "Service Provider:" + " " * size + "x"
+    yield "provider_newlines", "Service Provider:" + "\n \t" * (size // 3)
+    yield "repeated_client", "Client:" * (size // 7)
+    yield "repeated_client_address", "Client: Address:" * (size // 16)
+    yield "email_at_signs", "Contact Email: " + "a@" * (size // 2)
+    yield "amount_whitespace", ("amount of" + " " * 50) * (size // 59)
+    yield "governing_law_numbers", (
+        "6. Governing Law This Agreement will be governed by and construed in accordance with the laws of "
+        + "\n1." * (size // 3)
+    )
+    yield "termination_conditions", "4. Termination " + "conditions:" * (size // 11)
+    yield "payment_schedule", "2. Payment Terms " + "payment schedule:\n3." * (size // 20)
+    yield "services_without_end", (
+        "1. Services Provided The Service Provider agrees to provide the following services to the Client: "
+        + "x " * (size // 2)
+    )
+
+
+def fuzzed_texts(base_texts, count, size, seed=0):
+    """
+    Yields (name, text) pairs made by splicing long runs of whitespace and
+    repeated markers into real contract texts.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        text = rng.choice(base_texts)
+        for _ in range(rng.randint(1, 5)):
+            position = rng.randrange(len(text) + 1)
+            if rng.random() < 0.5:
+                insert = rng.choice([" ", "\n", "\t", " \n"]) * rng.randint(1, size)
+            else:
+                insert = rng.choice(markers) * rng.randint(1, max(1, size // 20))
+            text = text[:position] + insert + text[position:]
+        yield f"fuzz_{i}", text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run guarded extraction over adversarial contracts and check that its runtime stays bounded."
+    )
+    parser.add_argument("--size", type=int, default=20000, help="Approximate length of each adversarial text")
+    parser.add_argument("--fuzz", type=int, default=50, help="Number of fuzzed contracts")
+    parser.add_argument("--field-budget", type=float, default=DEFAULT_FIELD_BUDGET_S, help="Seconds allowed per field")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base_texts = [read_contract_file(BytesIO(content)) for content in generate_corpus(20, args.seed)]
+    cases = list(adversarial_texts(args.size)) + list(fuzzed_texts(base_texts, args.fuzz, args.size, args.seed))
+
+    # Every field may use its whole budget; allow a little for segmentation and overhead
+    bound = len(FIELD_NAMES) * args.field_budget + 0.5
+    worst = 0.0
+    failures = 0
+    for name, text in cases:
+        diagnostics = []
+        start = time.perf_counter()
+        extract_fields_guarded(text, field_budget_s=args.field_budget, diagnostics=diagnostics)
+        elapsed = time.perf_counter() - start
+        worst = max(worst, elapsed)
+        over = elapsed > bound
+        failures += over
+        status = "OVER BOUND" if over else "ok"
+        print(f"{name:28} {len(text):>9} chars {elapsed * 1000:9.1f} ms  {len(diagnostics):2} diagnostics  {status}")
+
+    print(f"\n{len(cases)} documents, worst case {worst * 1000:.1f} ms, bound {bound * 1000:.0f} ms")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, benchmarks_dir)
+
+from synthetic_corpus import generate_corpus  # noqa: E402  (also puts the repo on sys.path)
+
+from contract_loader import (  # noqa: E402
+    EXTRACTOR_VERSION,
+    FIELD_NAMES,
+    extract_field,
+    extract_fields,
+    read_contract_file,
+    segment_contract,
+)
+from contract_dedup import minhash_signature  # noqa: E402
+from validation_checks import check_completeness, validate_contract_data, validate_contracts  # noqa: E402
+
+# Documents used for the (slower) tracemalloc pass that measures peak memory
+MEMORY_SAMPLE = 50
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarize(durations, peak_bytes):
+    durations = sorted(durations)
+    total = sum(durations)
+    return {
+        "count": len(durations),
+        "total_s": round(total, 6),
+        "docs_per_sec": round(len(durations) / total, 2) if total > 0 else None,
+        "p50_ms": round(_percentile(durations, 0.50) * 1000, 4),
+        "p99_ms": round(_percentile(durations, 0.99) * 1000, 4),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def _time_each(func, inputs):
+    durations = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _peak_memory(func, inputs):
+    tracemalloc.start()
+    try:
+        for item in inputs[:MEMORY_SAMPLE]:
+            func(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _stages(include_ner):
+    """Returns (stage name, function, input kind) for every timed stage."""
+    stages = [
+        ("read", lambda content: read_contract_file(BytesIO(content)), "docx"),
+        ("segment", segment_contract, "text"),
+        ("extract", extract_fields, "text"),
+        ("minhash", minhash_signature, "text"),
+    ]
+    for field in FIELD_NAMES:
+        # Segmented once up front, so each field stage times only its own pattern
+        stages.append((f"field:{field}", lambda item, field=field: extract_field(item[0], field, item[1]), "segmented"))
+    stages.append(("validate", validate_contract_data, "data"))
+    if include_ner:
+        stages.append(("ner", check_completeness, "text"))
+    return stages
+
+
+def run_benchmarks(corpus, include_ner=True):
+    texts = [read_contract_file(BytesIO(content)) for content in corpus]
+    contract_data = [extract_fields(text) for text in texts]
+    segmented = [(text, segment_contract(text)) for text in texts]
+    inputs = {"docx": corpus, "text": texts, "segmented": segmented, "data": contract_data}
+
+    results = {}
+    for name, func, kind in _stages(include_ner):
+        if name == "ner":
+            try:
+                func(texts[0])
+            except OSError as e:
+                # The spaCy model is not installed
+                print(f"Skipping NER stage: {e}", file=sys.stderr)
+                continue
+        durations = _time_each(func, inputs[kind])
+        results[name] = _summarize(durations, _peak_memory(func, inputs[kind]))
+
+    # Batch validation is one call over every contract; per-document figures are its amortized cost
+    elapsed = _time_each(validate_contracts, [contract_data])[0]
+    results["validate_batch"] = _summarize([elapsed / len(contract_data)] * len(contract_data),
+                                           _peak_memory(validate_contracts, [contract_data]))
+    return results
+
+
+def compare(current, baseline):
+    """Prints the p50 and throughput change of each stage against a baseline report."""
+    for name, stats in current["stages"].items():
+        before = baseline["stages"].get(name)
+        if not before or not before["p50_ms"] or not before["docs_per_sec"] or not stats["docs_per_sec"]:
+            continue
+        p50_change = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        rate_change = (stats["docs_per_sec"] - before["docs_per_sec"]) / before["docs_per_sec"] * 100
+        print(f"{name:32} p50 {p50_change:+7.1f}%   docs/sec {rate_change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contract reading, extraction, validation and NER.")
+    parser.add_argument("-n", "--documents", type=int, default=200, help="Number of synthetic contracts")
+    parser.add_argument("--description-sentences", type=int, default=1, help="Sentences per service description (controls document size)")
+    parser.add_argument("--missing-rate", type=float, default=0.1, help="Probability that each optional field is left blank")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-ner", action="store_true", help="Do not benchmark the spaCy completeness check")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.documents, args.seed, args.description_sentences, args.missing_rate)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "extractor_version": EXTRACTOR_VERSION,
+            "documents": args.documents,
+            "description_sentences": args.description_sentences,
+            "missing_rate": args.missing_rate,
+            "seed": args.seed,
+            "mean_docx_bytes": sum(map(len, corpus)) // max(1, len(corpus)),
+        },
+        "stages": run_benchmarks(corpus, include_ner=not args.skip_ner),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
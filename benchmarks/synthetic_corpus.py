@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(benchmarks_dir)
+sys.path.insert(0, repo_dir)
+sys.path.insert(0, os.path.join(repo_dir, "Generate_test_samples"))
+
+from contract_data import contract_data_list  # noqa: E402
+from template_registry import TemplateRegistry  # noqa: E402
+
+default_template_path = os.path.join(repo_dir, "templates", "Contract_template.docx")
+
+# Fields the sample contracts leave blank to exercise the "Missing" paths
+optional_fields = [
+    "provider_address",
+    "provider_email",
+    "client_address",
+    "client_email",
+    "payment_terms",
+    "termination_conditions",
+    "governing_law",
+]
+
+
+def _format_date(value):
+    return value.strftime("%B %d, %Y")
+
+
+def synthetic_contract_rows(n, seed=0, description_sentences=1, missing_rate=0.1):
+    """
+    Yields n contract rows built from the contract_data.py samples, with
+    shuffled values, fresh dates, service descriptions of
+    description_sentences sentences, and each optional field blanked with
+    probability missing_rate.
+    """
+    rng = random.Random(seed)
+    descriptions = [row["service_description"] for row in contract_data_list]
+    for _ in range(n):
+        row = {key: rng.choice(contract_data_list)[key] for key in contract_data_list[0]}
+
+        contract_date = date(2023, 1, 1) + timedelta(days=rng.randrange(3 * 365))
+        start_date = contract_date + timedelta(days=rng.randrange(60))
+        end_date = start_date + timedelta(days=rng.choice([90, 180, 365, 730]))
+        row["contract_date"] = _format_date(contract_date)
+        row["start_date"] = _format_date(start_date)
+        row["end_date"] = _format_date(end_date)
+
+        row["service_description"] = " ".join(rng.choice(descriptions) for _ in range(description_sentences))
+        for field in optional_fields:
+            if rng.random() < missing_rate:
+                row[field] = ""
+        yield row
+
+
+def generate_corpus(n, seed=0, description_sentences=1, missing_rate=0.1, template_path=default_template_path):
+    """Renders n synthetic contracts and returns their DOCX bytes."""
+    registry = TemplateRegistry()
+    return [
+        registry.render(template_path, row).getvalue()
+        for row in synthetic_contract_rows(n, seed, description_sentences, missing_rate)
+    ]
@@ -0,0 +1,132 @@
+# contract_dates.py
+import calendar
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+# Dates are written into contracts as e.g. "November 15, 2024"
+DATE_FORMAT = "%B %d, %Y"
+DATE_COLUMNS = ["Start Date", "End Date", "Contract Date"]
+
+# Values the extractor uses for an absent field
+MISSING_VALUES = ("", "Missing")
+
+_MONTHS = {
+    **{name.lower(): number for number, name in enumerate(calendar.month_name) if name},
+    **{name.lower(): number for number, name in enumerate(calendar.month_abbr) if name},
+    "sept": 9,
+}
+_MONTH_DAY_YEAR_RE = re.compile(r"([A-Za-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})")
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ][\d:.]+)?")
+# Dates a datetime64[ns] column can hold
+_FIRST_TIMESTAMP_DATE = (pd.Timestamp.min + pd.Timedelta(days=1)).date()
+_LAST_TIMESTAMP_DATE = pd.Timestamp.max.date()
+
+
+def _fast_parse(value):
+    # Returns a date, None for an impossible date, or False when no known format matches
+    match = _MONTH_DAY_YEAR_RE.fullmatch(value)
+    if match:
+        month = _MONTHS.get(match.group(1).lower())
+        if month is None:
+            return False
+        year, day = int(match.group(3)), int(match.group(2))
+    else:
+        match = _ISO_DATE_RE.fullmatch(value)
+        if not match:
+            return False
+        year, month, day = (int(part) for part in match.groups())
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_date_string(value):
+    value = value.strip()
+    if value in MISSING_VALUES:
+        return None
+    parsed = _fast_parse(value)
+    if parsed is not False:
+        return parsed
+    # Not fuzzy: fuzzy parsing finds a "date" in almost any text (e.g. "Section 3")
+    try:
+        return parser.parse(value).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse_date(value):
+    """
+    Parses one contract date to a datetime.date, or None when it is missing
+    or not a date. "Month DD, YYYY" and ISO dates take a precompiled fast
+    path; other text falls back to dateutil. Results are memoized, since
+    archives repeat the same dates over and over.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return _parse_date_string(value)
+    return None
+
+
+def parse_timestamp(value):
+    """
+    Parses one contract date to a pandas Timestamp, or None when it is
+    missing, not a date, or outside the range of datetime64[ns] (so that it
+    agrees with parse_contract_dates).
+    """
+    parsed = parse_date(value)
+    if parsed is None or not _FIRST_TIMESTAMP_DATE <= parsed <= _LAST_TIMESTAMP_DATE:
+        return None
+    return pd.Timestamp(parsed)
+
+
+def parse_contract_dates(values):
+    """
+    Parses a column of contract dates; missing and malformed values become
+    NaT. Each distinct value is parsed once: the contract format in one
+    vectorized pass, and only what it misses through parse_date.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return pd.Series(pd.NaT, index=values.index, name=values.name, dtype="datetime64[ns]")
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=DATE_FORMAT, errors="coerce")
+    misses = parsed.isna().to_numpy()
+    if misses.any():
+        parsed[misses] = pd.to_datetime([parse_date(value) for value in uniques[misses]], errors="coerce")
+    # Dates outside the datetime64[ns] range would wrap around in the conversion below
+    parsed = parsed.where((parsed >= pd.Timestamp.min) & (parsed <= pd.Timestamp.max))
+    dates = parsed.to_numpy(dtype="datetime64[ns]")[codes]
+    dates[codes < 0] = np.datetime64("NaT")
+    return pd.Series(dates, index=values.index, name=values.name)
+
+
+def type_contract_dates(contract_data):
+    """
+    Replaces the date fields of an extracted contract dict with
+    datetime.date values, in place. Missing or unparseable values are left
+    as they were, so validation can still tell them apart. Returns the dict.
+    """
+    for field in DATE_COLUMNS:
+        value = contract_data.get(field)
+        if isinstance(value, str):
+            parsed = parse_date(value)
+            if parsed is not None:
+                contract_data[field] = parsed
+    return contract_data
+
+
+def dates_to_iso(contract_data):
+    """Returns a copy of a contract dict with its dates as ISO strings, for JSON."""
+    return {key: value.isoformat() if isinstance(value, date) else value for key, value in contract_data.items()}
@@ -0,0 +1,160 @@
+# contract_dedup.py
+import re
+import zlib
+
+import numpy as np
+
+# Word 5-grams: distinct contracts from one template share under half of
+# them, a contract re-issued with another date or amount well over 90%
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+# 16 bands of 8 rows put the LSH threshold near 0.7 Jaccard, so pairs at
+# the default 0.8 threshold become candidates about 95% of the time
+BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+
+_WORD_RE = re.compile(r"\w+")
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_LOW_32 = np.uint64(0xFFFFFFFF)
+_SHIFT_32 = np.uint64(32)
+_rng = np.random.RandomState(1)
+# Fixed seed: signatures are stored, so every process must draw the same hash functions
+_A = (_rng.randint(0, 1 << 62, size=NUM_PERM, dtype=np.int64).astype(np.uint64) << np.uint64(1) | np.uint64(1))[:, None]
+_B = _rng.randint(0, 1 << 62, size=NUM_PERM, dtype=np.int64).astype(np.uint64)[:, None]
+
+
+def shingle_hashes(text):
+    """
+    Returns 32-bit hashes of the word 5-grams of a contract text, one per
+    position (repeats are harmless to a minimum). Each word is hashed once,
+    and the hashes of five neighbours are combined in vectorized steps.
+    """
+    words = _WORD_RE.findall(text.lower())
+    word_hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+    # A text shorter than one shingle is a single shingle
+    count = max(len(words) - SHINGLE_WORDS + 1, 1) if words else 0
+    hashes = word_hashes[:count].copy()
+    for offset in range(1, min(SHINGLE_WORDS, len(words))):
+        # Wraps around modulo 2**64
+        hashes = hashes * _MIX + word_hashes[offset:offset + count]
+    return (hashes ^ (hashes >> _SHIFT_32)) & _LOW_32
+
+
+def minhash_signature(text):
+    """
+    Returns the MinHash signature of a contract text as NUM_PERM uint32
+    values, or None for a text without words. The fraction of equal values
+    in two signatures estimates the Jaccard similarity of their shingles.
+    """
+    hashes = shingle_hashes(text or "")
+    if not len(hashes):
+        return None
+    # Multiply-shift hashing: one odd multiplier per permutation, high 32 bits of the 64-bit result
+    return ((_A * hashes + _B) >> _SHIFT_32).min(axis=1).astype(np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(signature == other)) / len(signature)
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures. Each signature is
+    split into bands, and contracts that agree on a whole band share a
+    bucket, so finding the near-duplicates of a contract only compares it
+    with its bucket mates instead of the whole collection.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide {NUM_PERM}")
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = NUM_PERM // bands
+        self._buckets = [{} for _ in range(bands)]
+        # Signatures are rows of one growing matrix, so candidates are compared in a single numpy operation
+        self._ids = {}
+        self._keys = []
+        self._matrix = np.empty((1024, NUM_PERM), dtype=np.uint32)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def _band_keys(self, signature):
+        return [signature[band * self._rows:(band + 1) * self._rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key, signature):
+        """Adds a signature under key; a key already present is left as is."""
+        if signature is None or key in self._ids:
+            return
+        row = len(self._keys)
+        if row == len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.empty_like(self._matrix)])
+        self._matrix[row] = signature
+        self._ids[key] = row
+        self._keys.append(key)
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(row)
+
+    def query(self, signature):
+        """
+        Returns [(key, similarity)] of the indexed contracts whose estimated
+        similarity to signature reaches the threshold, most similar first.
+        """
+        if signature is None:
+            return []
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = np.count_nonzero(self._matrix[rows] == signature, axis=1) / NUM_PERM
+        hits = np.flatnonzero(scores >= self.threshold)
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self._keys[rows[hit]], float(scores[hit])) for hit in hits]
+
+    def signature(self, key):
+        """The signature stored under key."""
+        return self._matrix[self._ids[key]]
+
+    def first_match(self, signature):
+        """The key of the most similar indexed contract above the threshold, or None."""
+        matches = self.query(signature)
+        return matches[0][0] if matches else None
+
+
+def find_near_duplicates(keys, texts, threshold=DEFAULT_THRESHOLD):
+    """
+    Groups near-duplicate contracts. keys and texts are parallel sequences;
+    texts that are None are left out. Returns a list of groups, each a list
+    of keys in input order, for every group with more than one contract.
+    """
+    index = NearDuplicateIndex(threshold)
+    parent = {}
+
+    def root(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    order = []
+    for key, text in zip(keys, texts):
+        signature = minhash_signature(text) if text is not None else None
+        if signature is None or key in parent:
+            continue
+        parent[key] = key
+        order.append(key)
+        for match, _ in index.query(signature):
+            parent[root(match)] = root(key)
+        index.add(key, signature)
+
+    groups = {}
+    for key in order:
+        groups.setdefault(root(key), []).append(key)
+    return [group for group in groups.values() if len(group) > 1]
@@ -0,0 +1,310 @@
+# contract_diff.py
+"""
+Compares contracts with the template they were generated from, section by
+section, and reports boilerplate that was edited, added or removed.
+
+    python contract_diff.py generated_contracts --output deviations.csv
+    python contract_diff.py contracts.zip --template templates/Contract_template.docx
+
+Each template section is reduced once to its fixed text and a hash. A
+contract section is hashed after its field values are swapped back for
+the template's placeholders, and only sections whose hash differs are
+diffed word by word, so contracts that follow the template cost little
+more than reading them.
+"""
+import argparse
+import difflib
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from io import BytesIO
+
+import pandas as pd
+
+from contract_loader import SECTION_ORDER, iter_docx_members, read_contract_file, segment_contract
+
+DEFAULT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "Contract_template.docx")
+
+DEVIATION_COLUMNS = ["File Name", "Section", "Change", "Template Text", "Contract Text"]
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Placeholders, words and single punctuation marks
+_TOKEN_RE = re.compile(r"\{\{\w+\}\}|\w+|[^\w\s]")
+_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r" (?=[^\w\s{])")
+_SENTENCE_END_RE = re.compile(r"(?<=[.:;])\s+")
+
+
+def _normalize(text):
+    # Line breaks and runs of spaces differ between Word files without changing the text
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _is_placeholder(token):
+    return token.startswith("{{")
+
+
+def _join_tokens(tokens):
+    return _SPACE_BEFORE_PUNCTUATION_RE.sub("", " ".join(tokens))
+
+
+class _TemplateSection:
+    """One section of a template, reduced to what comparisons need."""
+
+    def __init__(self, text):
+        self.text = _PLACEHOLDER_RE.sub(r"{{\1}}", _normalize(text))
+        self.title = text.strip().split("\n", 1)[0].strip()
+        # Fixed text around the placeholders: literals[i] comes before placeholders[i]
+        parts = re.split(r"(\{\{\w+\}\})", self.text)
+        # Stripped, since an empty field value leaves one space where the template has two
+        self.literals = [literal.strip() for literal in parts[0::2]]
+        self.placeholders = parts[1::2]
+        self.digest = _digest(self.text)
+        # For diffs: the fixed text in sentence-sized pieces, each followed by a placeholder or None
+        self.pieces = []
+        for index, literal in enumerate(self.literals):
+            sentences = [sentence for sentence in _SENTENCE_END_RE.split(literal) if sentence]
+            for number, sentence in enumerate(sentences, start=1):
+                last = number == len(sentences) and index < len(self.placeholders)
+                self.pieces.append((sentence, self.placeholders[index] if last else None))
+            if not sentences and index < len(self.placeholders):
+                self.pieces.append(("", self.placeholders[index]))
+
+    def skeleton(self, text):
+        """
+        Replaces the field values in a normalized contract section with the
+        placeholders, by finding the fixed text in order. Returns text as is
+        when the fixed text is not all there.
+        """
+        literals = self.literals
+        if not self.placeholders:
+            return text
+        if not text.startswith(literals[0]) or not text.endswith(literals[-1]):
+            return text
+        position = len(literals[0])
+        end = len(text) - len(literals[-1])
+        for literal in literals[1:-1]:
+            position = text.find(literal, position, end)
+            if position < 0:
+                return text
+            position += len(literal)
+        if position > end:
+            return text
+        return self.text
+
+
+@lru_cache(maxsize=8)
+def _load_template_sections(template_path, mtime_ns):
+    text = read_contract_file(template_path)
+    sections = {}
+    for section, span in segment_contract(text).items():
+        if span is not None:
+            sections[section] = _TemplateSection(text[span[0]:span[1]])
+    return sections
+
+
+def load_template_sections(template_path=None):
+    """
+    Returns the sections of a contract template, keyed by the names in
+    SECTION_ORDER. Parsed once per template, and again when the file
+    changes.
+    """
+    template_path = os.path.abspath(template_path or DEFAULT_TEMPLATE_PATH)
+    return _load_template_sections(template_path, os.stat(template_path).st_mtime_ns)
+
+
+def _anchor_pieces(pieces, text):
+    # Places as much of the fixed text as possible: picks where each piece
+    # occurs, keeping the pieces in template order, with the first piece
+    # only at the start and the last only at the end. Returns
+    # [(piece index, start)] for the pieces that were placed.
+    candidates = []
+    last = len(pieces) - 1
+    for index, (piece, _) in enumerate(pieces):
+        if not piece:
+            continue
+        if index == 0 or index == last:
+            position = 0 if index == 0 else len(text) - len(piece)
+            if position >= 0 and text.startswith(piece, position):
+                candidates.append((index, position, position + len(piece)))
+            continue
+        position = text.find(piece)
+        while position >= 0 and len(candidates) < 64 * len(pieces):
+            candidates.append((index, position, position + len(piece)))
+            position = text.find(piece, position + 1)
+    candidates.sort(key=lambda candidate: candidate[1])
+    # Heaviest chain of candidates increasing in both piece index and position
+    best = []
+    for i, (index, start, end) in enumerate(candidates):
+        score, previous = len(pieces[index][0]), None
+        for j in range(i):
+            other_index, _, other_end = candidates[j]
+            if other_index < index and other_end <= start and best[j][0] + len(pieces[index][0]) > score:
+                score, previous = best[j][0] + len(pieces[index][0]), j
+        best.append((score, previous))
+    if not best:
+        return []
+    i = max(range(len(best)), key=lambda k: best[k][0])
+    chain = []
+    while i is not None:
+        chain.append((candidates[i][0], candidates[i][1]))
+        i = best[i][1]
+    return chain[::-1]
+
+
+def _diff_tokens(template_tokens, tokens):
+    changes = []
+    matcher = difflib.SequenceMatcher(None, template_tokens, tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        removed = template_tokens[i1:i2]
+        added = tokens[j1:j2]
+        fixed = [token for token in removed if not _is_placeholder(token)]
+        if len(fixed) < len(removed):
+            # The contract's words here are taken to be the field values; only fixed text can be missing
+            if fixed:
+                changes.append(("Removed", _join_tokens(fixed), ""))
+            continue
+        if not removed and (
+            (i1 > 0 and _is_placeholder(template_tokens[i1 - 1]))
+            or (i1 < len(template_tokens) and _is_placeholder(template_tokens[i1]))
+        ):
+            # Words next to a placeholder belong to the field value
+            continue
+        change = "Changed" if removed and added else "Added" if added else "Removed"
+        changes.append((change, _join_tokens(removed), _join_tokens(added)))
+    return changes
+
+
+def _diff_section(template_section, text):
+    # The pieces of fixed text the contract still has split both texts into
+    # aligned stretches, and only the stretches in between are diffed
+    pieces = template_section.pieces
+    changes = []
+    pending = []
+    position = 0
+    next_piece = 0
+    for index, start in _anchor_pieces(pieces, text) + [(len(pieces), len(text))]:
+        # Template text since the last anchor: its placeholder, then any pieces that were not found
+        for piece, placeholder in pieces[next_piece:index]:
+            pending.extend(part for part in (piece, placeholder) if part)
+        changes.extend(_diff_tokens(_TOKEN_RE.findall(" ".join(pending)), _TOKEN_RE.findall(text[position:start])))
+        if index == len(pieces):
+            break
+        piece, placeholder = pieces[index]
+        pending = [placeholder] if placeholder else []
+        position = start + len(piece)
+        next_piece = index + 1
+    return changes
+
+
+def compare_to_template(text, template_path=None):
+    """
+    Compares a contract's text with the template and returns its
+    deviations as dicts with the section title, the kind of change
+    ("Changed", "Added", "Removed" or "Missing Section"), the template
+    text and the contract text. Differences in field values are not
+    deviations. An empty list means the contract follows the template.
+    """
+    template_sections = load_template_sections(template_path)
+    spans = segment_contract(text)
+    deviations = []
+    for section in SECTION_ORDER:
+        template_section = template_sections.get(section)
+        if template_section is None:
+            continue
+        span = spans.get(section)
+        if span is None:
+            deviations.append({
+                "Section": template_section.title,
+                "Change": "Missing Section",
+                "Template Text": template_section.text,
+                "Contract Text": "",
+            })
+            continue
+        section_text = _normalize(text[span[0]:span[1]])
+        if _digest(template_section.skeleton(section_text)) == template_section.digest:
+            continue
+        for change, template_text, contract_text in _diff_section(template_section, section_text):
+            deviations.append({
+                "Section": template_section.title,
+                "Change": change,
+                "Template Text": template_text,
+                "Contract Text": contract_text,
+            })
+    return deviations
+
+
+def deviation_report(file_names, texts, template_path=None):
+    """
+    Compares many contracts with the template and returns one row per
+    deviation, with the DEVIATION_COLUMNS. Contracts that follow the
+    template have no rows.
+    """
+    rows = []
+    for file_name, text in zip(file_names, texts):
+        for deviation in compare_to_template(text, template_path):
+            rows.append({"File Name": file_name, **deviation})
+    return pd.DataFrame(rows, columns=DEVIATION_COLUMNS)
+
+
+def _compare_source(item, template_path=None):
+    # Runs in a worker process: reads one contract and compares it
+    file_name, source = item
+    try:
+        if isinstance(source, bytes):
+            source = BytesIO(source)
+        return file_name, compare_to_template(read_contract_file(source), template_path), None
+    except Exception as e:
+        return file_name, [], str(e)
+
+
+def _iter_sources(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, files in os.walk(path):
+                for file_name in sorted(files):
+                    if file_name.lower().endswith(".docx") and not file_name.startswith("~$"):
+                        full_path = os.path.join(directory, file_name)
+                        yield os.path.relpath(full_path, path), full_path
+        elif path.lower().endswith(".zip"):
+            yield from iter_docx_members(path)
+        else:
+            yield os.path.basename(path), path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report where contracts deviate from their template, section by section.")
+    parser.add_argument("paths", nargs="+", help="DOCX files, directories of them, or zip archives")
+    parser.add_argument("--template", help="Contract template (defaults to templates/Contract_template.docx)")
+    parser.add_argument("--output", help="Write the report to this CSV file instead of standard output")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to CPU count)")
+    args = parser.parse_args()
+
+    rows = []
+    compared = 0
+    compare = partial(_compare_source, template_path=args.template)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for file_name, deviations, error in pool.map(compare, _iter_sources(args.paths), chunksize=32):
+            compared += 1
+            if error:
+                print(f"Could not read {file_name}: {error}", file=sys.stderr)
+                continue
+            rows.extend({"File Name": file_name, **deviation} for deviation in deviations)
+
+    report = pd.DataFrame(rows, columns=DEVIATION_COLUMNS)
+    report.to_csv(args.output or sys.stdout, index=False)
+    deviating = report["File Name"].nunique()
+    print(f"{compared} contracts compared, {deviating} deviate from the template", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
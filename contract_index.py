@@ -0,0 +1,205 @@
+# contract_index.py
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from contract_dates import DATE_COLUMNS, parse_contract_dates
+from contract_insights import EXPIRY_WINDOW
+from contract_loader import FIELD_NAMES
+
+DEFAULT_INDEX_DIR = os.environ.get(
+    "CONTRACT_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".contract_index"),
+)
+
+# Identifies the file content a row was extracted from (SHA-256 hex digest)
+CONTENT_KEY = "Content Key"
+
+SCHEMA = pa.schema(
+    [(CONTENT_KEY, pa.string()), ("File Name", pa.string())]
+    + [
+        (field, pa.timestamp("ms") if field in DATE_COLUMNS else pa.string())
+        for field in FIELD_NAMES
+    ]
+)
+
+
+class ContractIndex:
+    """
+    Persistent columnar index of extracted contract fields, stored as a
+    directory of Parquet files. Each append writes a new file; reads scan
+    only the requested columns and push date and status filters down to
+    the Parquet reader.
+    """
+
+    def __init__(self, index_dir=None):
+        self.index_dir = index_dir or DEFAULT_INDEX_DIR
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def _part_files(self):
+        return sorted(
+            os.path.join(self.index_dir, name)
+            for name in os.listdir(self.index_dir)
+            if name.endswith(".parquet") and not name.startswith((".", "_"))
+        )
+
+    def _dataset(self):
+        return ds.dataset(self._part_files(), schema=SCHEMA, format="parquet")
+
+    def version(self):
+        """Returns a value that changes whenever the index is written to."""
+        return tuple(os.path.basename(path) for path in self._part_files())
+
+    def __len__(self):
+        if not self._part_files():
+            return 0
+        return self._dataset().count_rows()
+
+    def content_keys(self):
+        """Returns the set of content keys already in the index."""
+        if not self._part_files():
+            return set()
+        keys = self._dataset().to_table(columns=[CONTENT_KEY]).column(CONTENT_KEY)
+        return set(keys.drop_null().to_pylist())
+
+    def existing_keys(self, content_keys):
+        """
+        Returns which of the given content keys are already in the index.
+        Only matching keys are materialized, so the cost in memory does not
+        grow with the size of the index.
+        """
+        keys = pa.array(list(content_keys), type=pa.string())
+        if not len(keys) or not self._part_files():
+            return set()
+        table = self._dataset().to_table(columns=[CONTENT_KEY], filter=ds.field(CONTENT_KEY).isin(keys))
+        return set(table.column(CONTENT_KEY).to_pylist())
+
+    def append(self, records):
+        """
+        Adds extracted contract dicts to the index. Records carrying a
+        "Content Key" that is already indexed are skipped. Returns the number
+        of rows written.
+        """
+        df = pd.DataFrame(list(records), columns=SCHEMA.names)
+        if df.empty:
+            return 0
+        keyed = df[CONTENT_KEY].notna()
+        if keyed.any():
+            # Records without a content key are always kept
+            keys = df[CONTENT_KEY]
+            df = df[~(keyed & (keys.duplicated() | keys.isin(self.existing_keys(keys[keyed]))))]
+            if df.empty:
+                return 0
+
+        for column in DATE_COLUMNS:
+            df[column] = parse_contract_dates(df[column])
+        table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+        self._write(table)
+        return table.num_rows
+
+    def _write(self, table):
+        # Write under a hidden name first so readers never see a partial file
+        name = f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = os.path.join(self.index_dir, f".{name}.tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, os.path.join(self.index_dir, name))
+
+    def remove(self, content_keys):
+        """
+        Drops the rows with the given content keys, rewriting only the part
+        files that hold them. Returns the number of rows removed.
+        """
+        keys = pa.array(list(content_keys), type=pa.string())
+        if not len(keys):
+            return 0
+        removed = 0
+        for path in self._part_files():
+            matches = pc.is_in(pq.read_table(path, columns=[CONTENT_KEY]).column(CONTENT_KEY), value_set=keys)
+            count = pc.sum(matches).as_py() or 0
+            if not count:
+                continue
+            table = pq.read_table(path, schema=SCHEMA)
+            kept = table.filter(pc.invert(pc.is_in(table.column(CONTENT_KEY), value_set=keys)))
+            if kept.num_rows:
+                self._write(kept)
+            os.remove(path)
+            removed += count
+        return removed
+
+    def compact(self):
+        """Rewrites all part files into one, which keeps scans fast after many appends."""
+        part_files = self._part_files()
+        if len(part_files) <= 1:
+            return
+        self._write(self._dataset().to_table())
+        for path in part_files:
+            os.remove(path)
+
+    def load(self, columns=None, status=None, end_from=None, end_to=None, today=None):
+        """
+        Loads indexed contracts as a dataframe.
+
+        columns limits which columns are read. status is a status name or a
+        list of them (see contract_insights.STATUS_CATEGORIES) and, like
+        end_from/end_to, is applied to "End Date" while scanning.
+        """
+        columns = list(columns) if columns is not None else SCHEMA.names
+        if not self._part_files():
+            return pd.DataFrame({name: pd.Series(dtype=SCHEMA.field(name).type.to_pandas_dtype()) for name in columns})
+
+        table = self._dataset().to_table(columns=columns, filter=_end_date_filter(status, end_from, end_to, today))
+        return table.to_pandas()
+
+
+    def iter_batches(self, columns=None, batch_size=65536, status=None, end_from=None, end_to=None, today=None):
+        """
+        Yields the indexed contracts as dataframes of at most batch_size rows,
+        with the same arguments as load, so the whole index is never in
+        memory at once.
+        """
+        if not self._part_files():
+            return
+        columns = list(columns) if columns is not None else SCHEMA.names
+        scanner = self._dataset().scanner(
+            columns=columns, filter=_end_date_filter(status, end_from, end_to, today), batch_size=batch_size
+        )
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+
+def _timestamp(value):
+    return pa.scalar(pd.Timestamp(value).to_pydatetime(), type=pa.timestamp("ms"))
+
+
+def _end_date_filter(status, end_from, end_to, today):
+    end_date = ds.field("End Date")
+    expression = None
+
+    if status is not None:
+        statuses = [status] if isinstance(status, str) else list(status)
+        today = pd.Timestamp(today if today is not None else datetime.today())
+        expiring_until = _timestamp(today + EXPIRY_WINDOW)
+        today = _timestamp(today)
+        by_status = {
+            "Expired": end_date < today,
+            "Expiring Soon": (end_date >= today) & (end_date <= expiring_until),
+            # Contracts without an end date count as Active, as in contract_status
+            "Active": (end_date > expiring_until) | end_date.is_null(),
+        }
+        for name in statuses:
+            expression = by_status[name] if expression is None else expression | by_status[name]
+
+    if end_from is not None:
+        condition = end_date >= _timestamp(end_from)
+        expression = condition if expression is None else expression & condition
+    if end_to is not None:
+        condition = end_date <= _timestamp(end_to)
+        expression = condition if expression is None else expression & condition
+    return expression
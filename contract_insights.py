@@ -0,0 +1,192 @@
+# contract_insights.py
+import hashlib
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from contract_dates import DATE_COLUMNS, parse_contract_dates
+from contract_loader import extract_many
+
+STATUS_CATEGORIES = ["Active", "Expiring Soon", "Expired"]
+EXPIRY_WINDOW = pd.Timedelta(days=30)
+
+# Columns whose nulls mark a contract as having issues
+ISSUE_COLUMNS = ["Start Date", "End Date", "Service Provider", "Client Name"]
+
+# Width of the contract length histogram's bins
+LENGTH_BIN_DAYS = 30
+
+
+def contract_status(end_dates, today=None):
+    """
+    Classifies contracts as Expired, Expiring Soon (within 30 days) or Active
+    from their end dates, without a per-row Python call.
+    """
+    today = pd.Timestamp(today if today is not None else datetime.today())
+    end_dates = pd.Series(end_dates)
+    conditions = [
+        (end_dates < today).to_numpy(),
+        (end_dates <= today + EXPIRY_WINDOW).to_numpy(),
+    ]
+    # Select category codes rather than strings so no per-row label is built
+    codes = np.select(conditions, [2, 1], default=0).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=STATUS_CATEGORIES), index=end_dates.index)
+
+
+def build_insights_frame(contract_data, today=None):
+    """
+    Builds the Contract Insights dataframe from extracted contract dicts (or a
+    dataframe of them): parsed dates, contract length in days, status, and
+    categorical governing law.
+    """
+    df = pd.DataFrame(contract_data)
+    for column in DATE_COLUMNS:
+        # An empty batch has no columns at all; a missing date is NaT like an unparseable one
+        df[column] = parse_contract_dates(df[column]) if column in df else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+
+    df["Contract Length"] = (df["End Date"] - df["Start Date"]).dt.days
+    df["Status"] = contract_status(df["End Date"], today)
+    if "Governing Law" in df:
+        df["Governing Law"] = df["Governing Law"].astype("category")
+    return df
+
+
+def _count_issues(df):
+    return int(df[[column for column in ISSUE_COLUMNS if column in df]].isnull().any(axis=1).sum())
+
+
+def _count_length_bins(lengths, bin_counts):
+    # Adds contract lengths to a {bin number: count} dict of LENGTH_BIN_DAYS-day bins
+    bins, counts = np.unique(np.floor_divide(lengths, LENGTH_BIN_DAYS).astype(np.int64), return_counts=True)
+    for number, count in zip(bins.tolist(), counts.tolist()):
+        bin_counts[number] = bin_counts.get(number, 0) + count
+    return bin_counts
+
+
+def length_histogram(bin_counts, max_bins=40):
+    """
+    Turns {bin number: count} into (edges, counts) arrays for plotting,
+    with empty bins filled in between the shortest and longest contracts.
+    Neighbouring bins are merged until there are at most max_bins.
+    """
+    if not bin_counts:
+        return np.array([0, LENGTH_BIN_DAYS]), np.array([0])
+    first, last = min(bin_counts), max(bin_counts)
+    counts = np.array([bin_counts.get(number, 0) for number in range(first, last + 1)])
+    merge = -(-len(counts) // max_bins)
+    counts = np.pad(counts, (0, -len(counts) % merge)).reshape(-1, merge).sum(axis=1)
+    return (first + np.arange(len(counts) + 1) * merge) * LENGTH_BIN_DAYS, counts
+
+
+def summarize_insights(df):
+    """Returns the headline statistics shown on the dashboard."""
+    status_counts = df["Status"].value_counts()
+    return {
+        "total": len(df),
+        "active": int(status_counts.get("Active", 0)),
+        "expiring": int(status_counts.get("Expiring Soon", 0)),
+        "with_issues": _count_issues(df),
+        "average_length": df["Contract Length"].mean(),
+        "status_counts": status_counts[status_counts > 0],
+        "length_histogram": length_histogram(_count_length_bins(df["Contract Length"].dropna().to_numpy(), {})),
+    }
+
+
+class InsightsAggregator:
+    """
+    Dashboard statistics over contracts fed in batches, kept as running
+    totals: counts by status and of contracts with issues, the sum of
+    contract lengths for the mean, and a histogram of lengths in fixed
+    LENGTH_BIN_DAYS-day bins. Memory does not grow with the number of
+    contracts, so archives larger than RAM can be summarized.
+    """
+
+    def __init__(self, today=None):
+        self.today = today
+        self.total = 0
+        self.with_issues = 0
+        self.status_counts = pd.Series(0, index=STATUS_CATEGORIES, dtype="int64")
+        self.length_sum = 0
+        self.length_count = 0
+        self.length_bins = {}
+
+    def update(self, contract_data):
+        """Adds a batch of extracted contract dicts (or a dataframe of them)."""
+        if len(contract_data) == 0:
+            return
+        df = build_insights_frame(contract_data, today=self.today)
+        self.total += len(df)
+        self.status_counts += df["Status"].value_counts().reindex(STATUS_CATEGORIES, fill_value=0)
+        self.with_issues += _count_issues(df)
+        lengths = df["Contract Length"].dropna().to_numpy()
+        self.length_sum += int(lengths.sum())
+        self.length_count += len(lengths)
+        _count_length_bins(lengths, self.length_bins)
+
+    def update_many(self, contracts, batch_size=1000):
+        """Consumes an iterable of contract dicts, batch_size at a time."""
+        contracts = iter(contracts)
+        while batch := list(islice(contracts, batch_size)):
+            self.update(batch)
+
+    def summary(self):
+        """Returns the same statistics as summarize_insights."""
+        status_counts = self.status_counts
+        return {
+            "total": self.total,
+            "active": int(status_counts["Active"]),
+            "expiring": int(status_counts["Expiring Soon"]),
+            "with_issues": self.with_issues,
+            "average_length": self.length_sum / self.length_count if self.length_count else float("nan"),
+            "status_counts": status_counts[status_counts > 0],
+            "length_histogram": length_histogram(self.length_bins),
+        }
+
+
+def stream_insights(contracts, index, search_index=None, cache=None, today=None, include_archive=False,
+                    columns=None, batch_size=500, progress=None):
+    """
+    Extracts (name, bytes) contracts batch_size at a time, adds them to a
+    ContractIndex (and a ContractSearchIndex if given) and aggregates them
+    with an InsightsAggregator, so memory does not grow with the number of
+    contracts. With include_archive, the whole index is aggregated instead,
+    reading only columns. progress, if given, is called with the number of
+    contracts processed after each batch.
+
+    Returns (summary, names of the contracts that could not be extracted).
+    """
+    aggregator = InsightsAggregator(today)
+    failed = []
+    processed = 0
+    contracts = iter(contracts)
+    while batch := list(islice(contracts, batch_size)):
+        file_names = [file_name for file_name, _ in batch]
+        contents = [content for _, content in batch]
+        records = []
+        search_entries = []
+        results = extract_many(contents, cache=cache, names=file_names, guarded=True)
+        for file_name, content, (contract_data, contract_text, error) in zip(file_names, contents, results):
+            if error:
+                failed.append(file_name)
+                continue
+            content_key = hashlib.sha256(content).hexdigest()
+            contract_data["File Name"] = file_name
+            contract_data["Content Key"] = content_key
+            records.append(contract_data)
+            search_entries.append((content_key, file_name, contract_data, contract_text))
+        index.append(records)
+        if search_index is not None:
+            search_index.add(search_entries)
+        if not include_archive:
+            aggregator.update(records)
+        processed += len(batch)
+        if progress is not None:
+            progress(processed)
+
+    if include_archive:
+        # The new contracts are in the index now, so the archive covers them too
+        for df in index.iter_batches(columns=columns):
+            aggregator.update(df)
+    return aggregator.summary(), failed
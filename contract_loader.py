@@ -1,133 +1,692 @@
 #contract_loader.py
+import hashlib
+import os
+import posixpath
+import logging
 import re
+import signal
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from io import BytesIO
 from docx import Document
+from contract_dates import type_contract_dates
+from contract_dedup import minhash_signature
 
-def read_contract_file(file_path):
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to reading or extraction can change the output, so
+# cached results from an older extractor are not reused
+EXTRACTOR_VERSION = "5"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W + "body"
+_W_P = _W + "p"
+_W_R = _W + "r"
+_W_HYPERLINK = _W + "hyperlink"
+_W_T = _W + "t"
+_W_BR = _W + "br"
+_W_BR_TYPE = _W + "type"
+
+# Text equivalents of run content other than w:t, as python-docx renders them
+_RUN_CONTENT_TEXT = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+
+def iter_paragraph_text(source):
+    """
+    Streams the text of each body paragraph from a DOCX file path or buffer.
+    Parses word/document.xml incrementally and clears every paragraph once
+    its text has been yielded, so memory stays flat on long contracts.
+    """
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document_xml:
+        ancestors = []
+        parts = []
+        for event, elem in ET.iterparse(document_xml, events=("start", "end")):
+            if event == "start":
+                ancestors.append(elem.tag)
+                continue
+            ancestors.pop()
+            depth = len(ancestors)
+
+            if depth == 2:
+                # Direct child of w:body: a paragraph, table or section properties
+                if elem.tag == _W_P:
+                    yield "".join(parts)
+                    parts = []
+                elem.clear()
+                continue
+
+            # Run content of a body paragraph, directly or inside a hyperlink
+            if depth < 4 or ancestors[-1] != _W_R or ancestors[1] != _W_BODY or ancestors[2] != _W_P:
+                continue
+            if depth == 5 and ancestors[3] != _W_HYPERLINK or depth > 5:
+                continue
+            if elem.tag == _W_T:
+                parts.append(elem.text or "")
+            elif elem.tag == _W_BR:
+                if elem.get(_W_BR_TYPE, "textWrapping") == "textWrapping":
+                    parts.append("\n")
+            elif elem.tag in _RUN_CONTENT_TEXT:
+                parts.append(_RUN_CONTENT_TEXT[elem.tag])
+
+def _read_with_python_docx(file_path):
     doc = Document(file_path)
     full_text = []
     for para in doc.paragraphs:
         full_text.append(para.text)
     return '\n'.join(full_text)
 
-def extract_service_provider(text):
-    pattern = r"Service Provider:\s*(.*?)\s*Address:"
-    match = re.search(pattern, text, re.DOTALL)
-    result = match.group(1).strip() if match and match.group(1).strip() != "" else "Missing"
-    return result
-
-def extract_provider_address(text):
-    pattern = r"Service Provider:\s*(?:.*?\s*)Address:\s*(.*?)(?=\s*Contact Email:|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    address = match.group(1).strip() if match else ""
-    return address if address else "Missing"
-
-def extract_provider_email(text):
-    pattern = r"Contact Email:\s*(\S+@\S+\.\S+)"
-    match = re.search(pattern, text)
-    email = match.group(1).strip() if match else ""
-    return email if email else "Missing"
-
-def extract_client_email(text):
-    pattern = r"Client:.*?Contact Email:\s*(.*?)(?=\s*(?:\d\. Services Provided|$))"
-    match = re.search(pattern, text, re.DOTALL)
-    email = match.group(1).strip() if match else ""
-    return email if email else "Missing"
-
-def extract_client_name(text):
-    pattern = r"Client:\s*(.*?)\s*(?:Address:|Contact Email:|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    name = match.group(1).strip() if match else ""
-    return name if name else "Missing"
-
-def extract_client_address(text):
-    pattern = r"Client:.*?Address:\s*(.*?)(?=\s*Contact Email:|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    address = match.group(1).strip() if match else ""
-    return address if address else "Missing"
-
-def extract_service_description(text):
-    pattern = r"1\.\s*Services Provided\s*The Service Provider agrees to provide the following services to the Client:\s*(.*?)(?=2\.\s*Payment Terms|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    service_description = match.group(1).strip() if match else ""
-    return service_description if service_description else "Missing"
-
-def extract_payment_amount(text):
-    pattern = r"amount of\s*\$?\s*(\d+(\.\d{2})?)"
-    match = re.search(pattern, text)
-    payment_amount = match.group(1).strip() if match else ""
-    return payment_amount if payment_amount else "Missing"
-
-def extract_payment_terms(text):
-    pattern = r"2\.\s*Payment Terms\s*(.*?)(?=\n3\.\s*Contract Duration|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    payment_terms = match.group(1).strip() if match else ""
+def read_contract_file(file_path):
+    try:
+        return '\n'.join(iter_paragraph_text(file_path))
+    except (KeyError, ET.ParseError):
+        # Main part is not at word/document.xml or could not be streamed;
+        # let python-docx resolve it through the package relationships
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+        return _read_with_python_docx(file_path)
+
+# Field registry
+#
+# Each template variant is described by a FieldSet: the numbered section
+# headings of the template, and a FieldSpec per field saying which section
+# the field is in, the pattern whose first group is its value, and the
+# clean-up steps applied to that value. Patterns are compiled once, when the
+# specs are created at import. Extraction finds all section headings with a
+# single scan, then runs each field's pattern only inside its section; a
+# field whose pattern finds nothing there is searched for in the whole text.
+#
+# Variants register their own field sets with register_field_set and are
+# chosen by name with the field_set argument of the functions below.
+# Register them at import time of a module, so that extract_many's pool
+# workers (forked from the process that imported it) know them too.
+
+
+class FieldSpec:
+    """
+    One extracted field: its name, the section it is searched in, its
+    pattern (the value is the first group) and the steps that clean up the
+    matched value, applied in order. An empty value is "Missing".
+    """
+
+    def __init__(self, name, section, pattern, flags=0, steps=()):
+        self.name = name
+        self.section = section
+        self.pattern = re.compile(pattern, flags)
+        self.steps = tuple(steps)
+
+    def value(self, match):
+        value = match.group(1).strip()
+        for step in self.steps:
+            value = step(value)
+        return value if value else "Missing"
+
+
+class FieldSet:
+    """
+    The fields of one template variant. headings lists the template's
+    numbered sections in document order as (section, number, title), e.g.
+    ("payment", 2, "Payment Terms"); the text before the first heading is
+    the "preamble" section. One pattern matches every heading, and the
+    number is checked after the match.
+    """
+
+    def __init__(self, name, headings, fields):
+        self.name = name
+        self.headings = tuple(headings)
+        self.fields = tuple(fields)
+        self.section_order = ("preamble", *(section for section, _, _ in self.headings))
+        self.field_names = tuple(spec.name for spec in self.fields)
+        unknown = {spec.section for spec in self.fields} - set(self.section_order)
+        if unknown:
+            raise ValueError(f"Field set {name} has fields in unknown sections: {', '.join(sorted(unknown))}")
+        self._specs = {spec.name: spec for spec in self.fields}
+        self._sections = {(str(number), title): section for section, number, title in self.headings}
+        # Longest titles first, so a title is not cut short by another that it starts with
+        titles = sorted({title for _, _, title in self.headings}, key=len, reverse=True)
+        self._heading_re = re.compile(r"(\d+)\.\s*(" + "|".join(map(re.escape, titles)) + ")")
+
+    def spec(self, field):
+        return self._specs[field]
+
+    def segment(self, text):
+        starts = {}
+        for match in self._heading_re.finditer(text):
+            section = self._sections.get(match.groups())
+            if section is not None:
+                starts.setdefault(section, match.start())
+
+        order = self.section_order
+        spans = {"preamble": (0, starts.get(order[1], len(text)) if len(order) > 1 else len(text))}
+        for index, section in enumerate(order[1:], start=1):
+            start = starts.get(section)
+            if start is None:
+                spans[section] = None
+                continue
+            next_start = starts.get(order[index + 1]) if index + 1 < len(order) else None
+            end = next_start if next_start is not None and next_start > start else len(text)
+            spans[section] = (start, end)
+        return spans
+
+
+FIELD_SETS = {}
+DEFAULT_FIELD_SET = "standard"
+
+
+def register_field_set(field_set):
+    """
+    Makes a FieldSet available to the extraction functions under its name,
+    replacing any field set of that name. Returns the field set.
+    """
+    FIELD_SETS[field_set.name] = field_set
+    return field_set
+
+
+def get_field_set(name=None):
+    """Returns the registered FieldSet called name, or the standard template's."""
+    try:
+        return FIELD_SETS[name or DEFAULT_FIELD_SET]
+    except KeyError:
+        raise ValueError(f"Unknown field set: {name}") from None
+
+
+# Clean-up steps for FieldSpec
+
+def after_marker(marker):
+    """Step that keeps the text after the last occurrence of marker, or all of it without one."""
+    def step(value):
+        return value.split(marker)[-1].strip()
+    return step
+
+
+def cut_from(pattern):
+    """Step that drops everything from the first match of pattern on."""
+    compiled = re.compile(pattern)
+
+    def step(value):
+        match = compiled.search(value)
+        return value[:match.start()].strip() if match else value
+    return step
+
+
+def strip_line_prefix(pattern):
+    """Step that removes pattern from the start of every line, e.g. bullets."""
+    compiled = re.compile(r"^(?:" + pattern + ")", re.MULTILINE)
+
+    def step(value):
+        return compiled.sub("", value).strip()
+    return step
+
+
+_TRAILING_SECTION_3_RE = re.compile(r"\n3\..*", re.DOTALL)
+
+
+def _clean_payment_terms(payment_terms):
+    # The schedule, when the terms name one
     if "payment schedule:" in payment_terms:
         payment_terms = payment_terms.split("payment schedule:")[1].strip()
-        payment_terms = re.sub(r"\n3\..*", "", payment_terms, flags=re.DOTALL).strip()
-    return payment_terms if payment_terms else "Missing"
-
-def extract_termination_conditions(text):
-    pattern = r"4\.\s*Termination\s*(.*?)(?=5\.\s*Confidentiality|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    termination_conditions = match.group(1).strip() if match else ""
-    if termination_conditions:
-        # Remove the "under the following conditions:" if it exists
-        termination_conditions = termination_conditions.split("conditions:")[-1].strip()
-        # Remove any section headers that come after the conditions
-        termination_conditions = re.sub(r"\n5\..*", "", termination_conditions, flags=re.DOTALL).strip()
-        # Remove any leading bullet points or spaces
-        termination_conditions = re.sub(r"^-?\s*•?\s*", "", termination_conditions, flags=re.MULTILINE).strip()
-    return termination_conditions if termination_conditions else "Missing"
-
-def extract_governing_law(text):
-    pattern = r"6\.\s*Governing Law\s*This Agreement will be governed by and construed in accordance with the laws of\s*(.*?)(?=\n\d+\.\s|7\.\s*Signatures|$)"
-    match = re.search(pattern, text, re.DOTALL)
-    governing_law = match.group(1).strip() if match else ""
-    return governing_law if governing_law else "Missing"
-    
-def extract_start_date(text):
-    pattern = r"This Agreement will begin on (\w+ \d{1,2}, \d{4})"
-    match = re.search(pattern, text)
-    start_date = match.group(1).strip() if match else ""
-    return start_date if start_date else "Missing"
-
-
-def extract_end_date(text):
-    pattern = r"will continue until (\w+ \d{1,2}, \d{4})"
-    match = re.search(pattern, text)
-    end_date = match.group(1).strip() if match else ""
-    return end_date if end_date else "Missing"
-
-def extract_contract_date(text):
-    pattern = r"entered into on (\w+ \d{1,2}, \d{4})"
-    match = re.search(pattern, text)
-    contract_date = match.group(1).strip() if match else ""
-    return contract_date if contract_date else "Missing"
+        payment_terms = _TRAILING_SECTION_3_RE.sub("", payment_terms).strip()
+    return payment_terms
+
+
+register_field_set(FieldSet(
+    DEFAULT_FIELD_SET,
+    headings=(
+        ("services", 1, "Services Provided"),
+        ("payment", 2, "Payment Terms"),
+        ("duration", 3, "Contract Duration"),
+        ("termination", 4, "Termination"),
+        ("confidentiality", 5, "Confidentiality"),
+        ("governing_law", 6, "Governing Law"),
+        ("signatures", 7, "Signatures"),
+    ),
+    fields=(
+        FieldSpec("Service Provider", "preamble", r"Service Provider:\s*(.*?)\s*Address:", re.DOTALL),
+        FieldSpec("Provider Address", "preamble", r"Service Provider:\s*(?:.*?\s*)Address:\s*(.*?)(?=\s*Contact Email:|$)", re.DOTALL),
+        FieldSpec("Provider Email", "preamble", r"Contact Email:\s*(\S+@\S+\.\S+)"),
+        FieldSpec("Client Name", "preamble", r"Client:\s*(.*?)\s*(?:Address:|Contact Email:|$)", re.DOTALL),
+        FieldSpec("Client Address", "preamble", r"Client:.*?Address:\s*(.*?)(?=\s*Contact Email:|$)", re.DOTALL),
+        FieldSpec("Client Email", "preamble", r"Client:.*?Contact Email:\s*(.*?)(?=\s*(?:\d\. Services Provided|$))", re.DOTALL),
+        FieldSpec("Service Description", "services", r"1\.\s*Services Provided\s*The Service Provider agrees to provide the following services to the Client:\s*(.*?)(?=2\.\s*Payment Terms|$)", re.DOTALL),
+        FieldSpec("Payment Amount", "payment", r"amount of\s*\$?\s*(\d+(\.\d{2})?)"),
+        FieldSpec("Payment Terms", "payment", r"2\.\s*Payment Terms\s*(.*?)(?=\n3\.\s*Contract Duration|$)", re.DOTALL,
+                  steps=(_clean_payment_terms,)),
+        FieldSpec("Termination Conditions", "termination", r"4\.\s*Termination\s*(.*?)(?=5\.\s*Confidentiality|$)", re.DOTALL,
+                  steps=(after_marker("conditions:"), cut_from(r"\n5\."), strip_line_prefix(r"-?\s*•?\s*"))),
+        FieldSpec("Governing Law", "governing_law", r"6\.\s*Governing Law\s*This Agreement will be governed by and construed in accordance with the laws of\s*(.*?)(?=\n\d+\.\s|7\.\s*Signatures|$)", re.DOTALL),
+        FieldSpec("Start Date", "duration", r"This Agreement will begin on (\w+ \d{1,2}, \d{4})"),
+        FieldSpec("End Date", "duration", r"will continue until (\w+ \d{1,2}, \d{4})"),
+        FieldSpec("Contract Date", "preamble", r"entered into on (\w+ \d{1,2}, \d{4})"),
+    ),
+))
+
+# Sections and field names of the standard template, in document and extraction order
+SECTION_ORDER = FIELD_SETS[DEFAULT_FIELD_SET].section_order
+FIELD_NAMES = FIELD_SETS[DEFAULT_FIELD_SET].field_names
+
+
+def segment_contract(text, field_set=None):
+    """
+    Splits the contract text into its sections with a single scan for the
+    numbered headings. Returns a dict mapping each section of the field set
+    (SECTION_ORDER for the standard template) to a (start, end) span, or
+    None when the heading is not in the text.
+    """
+    return get_field_set(field_set).segment(text)
+
+
+def _extract_spec(text, spans, spec, fallback_text=None):
+    span = spans[spec.section]
+    match = spec.pattern.search(text, *span) if span else None
+    if match is None:
+        # Not in its section, e.g. the headings were edited: the whole text
+        match = spec.pattern.search(text if fallback_text is None else fallback_text)
+        if match is None:
+            return "Missing"
+    return spec.value(match)
+
+
+def extract_field(text, field, spans=None, field_set=None):
+    """
+    Extracts a single field by name. Pass the spans from segment_contract
+    when extracting several fields from the same text.
+    """
+    field_set = get_field_set(field_set)
+    if spans is None:
+        spans = field_set.segment(text)
+    return _extract_spec(text, spans, field_set.spec(field))
+
+
+def extract_fields(text, timings=None, field_set=None):
+    """
+    Extracts every field of the field set from the text in one segmented
+    pass and returns them as a dict, in the field set's order.
+
+    If a timings dict is given, the wall time of the segmentation and of
+    each field is stored in it under "segment" and "field:<name>".
+    """
+    field_set = get_field_set(field_set)
+    if timings is None:
+        spans = field_set.segment(text)
+        return {spec.name: _extract_spec(text, spans, spec) for spec in field_set.fields}
+
+    start = time.perf_counter()
+    spans = field_set.segment(text)
+    timings["segment"] = time.perf_counter() - start
+    contract_data = {}
+    for spec in field_set.fields:
+        start = time.perf_counter()
+        contract_data[spec.name] = _extract_spec(text, spans, spec)
+        timings[f"field:{spec.name}"] = time.perf_counter() - start
+    return contract_data
+
+
+# Single fields of the standard template, searched in the whole text
+
+def _whole_text_field(field):
+    spec = FIELD_SETS[DEFAULT_FIELD_SET].spec(field)
+
+    def extract(text):
+        match = spec.pattern.search(text)
+        return spec.value(match) if match else "Missing"
+    extract.__name__ = "extract_" + re.sub(r"\W+", "_", field.lower())
+    return extract
+
+
+extract_service_provider = _whole_text_field("Service Provider")
+extract_provider_address = _whole_text_field("Provider Address")
+extract_provider_email = _whole_text_field("Provider Email")
+extract_client_name = _whole_text_field("Client Name")
+extract_client_address = _whole_text_field("Client Address")
+extract_client_email = _whole_text_field("Client Email")
+extract_service_description = _whole_text_field("Service Description")
+extract_payment_amount = _whole_text_field("Payment Amount")
+extract_payment_terms = _whole_text_field("Payment Terms")
+extract_termination_conditions = _whole_text_field("Termination Conditions")
+extract_governing_law = _whole_text_field("Governing Law")
+extract_start_date = _whole_text_field("Start Date")
+extract_end_date = _whole_text_field("End Date")
+extract_contract_date = _whole_text_field("Contract Date")
+
+# Guarded extraction
+#
+# Some of the patterns above backtrack badly on malformed input (e.g. a
+# "Service Provider:" followed by thousands of spaces is cubic). Guarded
+# extraction searches each field only in a bounded window of its section
+# and gives every field a time budget. Python's re module cannot be
+# cancelled from another thread, but it does check for signals, so the
+# budget is enforced with SIGALRM. That needs the main thread of a process
+# on a Unix system, which is where extract_many's pool workers run the
+# extraction; elsewhere only the windows bound the work, and overruns are
+# reported after the fact.
+
+DEFAULT_FIELD_BUDGET_S = 0.2
+DEFAULT_WINDOW_CHARS = 100_000
+
+
+class FieldTimeout(Exception):
+    pass
+
+
+def _raise_field_timeout(signum, frame):
+    raise FieldTimeout()
+
+
+def _can_interrupt():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def extract_fields_guarded(text, field_budget_s=DEFAULT_FIELD_BUDGET_S, window_chars=DEFAULT_WINDOW_CHARS,
+                           diagnostics=None, timings=None, field_set=None):
+    """
+    Like extract_fields, but each field searches at most window_chars
+    characters and is abandoned after field_budget_s seconds. An abandoned
+    field is "Missing", and a message explaining why is appended to the
+    diagnostics list when one is given.
+    """
+    if diagnostics is None:
+        diagnostics = []
+    field_set = get_field_set(field_set)
+    spans = {
+        section: (span[0], min(span[1], span[0] + window_chars)) if span else None
+        for section, span in field_set.segment(text).items()
+    }
+    fallback_text = text[:window_chars]
+    interrupt = _can_interrupt()
+    previous_handler = signal.signal(signal.SIGALRM, _raise_field_timeout) if interrupt else None
+
+    contract_data = {}
+    try:
+        for spec in field_set.fields:
+            field = spec.name
+            start = time.perf_counter()
+            try:
+                try:
+                    if interrupt:
+                        signal.setitimer(signal.ITIMER_REAL, field_budget_s)
+                    value = _extract_spec(text, spans, spec, fallback_text)
+                finally:
+                    if interrupt:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+            except FieldTimeout:
+                value = "Missing"
+                diagnostics.append(f"{field}: gave up after {field_budget_s * 1000:.0f} ms")
+            elapsed = time.perf_counter() - start
+            if not interrupt and elapsed > field_budget_s:
+                diagnostics.append(f"{field}: took {elapsed * 1000:.0f} ms, over the {field_budget_s * 1000:.0f} ms budget")
+            if value == "Missing" and len(text) > window_chars:
+                diagnostics.append(f"{field}: searched only the first {window_chars} characters")
+            if timings is not None:
+                timings[f"field:{field}"] = elapsed
+            contract_data[field] = value
+    finally:
+        if interrupt:
+            signal.signal(signal.SIGALRM, previous_handler)
+    return contract_data
 
 # Define the main function
 
-def extract_contract_data(file_path):
+def extract_contract_data(file_path, timings=None, guarded=False, diagnostics=None, field_set=None):
     # Read the contract
+    start = time.perf_counter()
     contract_text = read_contract_file(file_path)
+    if timings is not None:
+        timings["read"] = time.perf_counter() - start
 
-    # Initialize contract data dictionary
-    contract_data = {}
-
-    # Apply extraction functions and store results in contract_data
-    contract_data['Service Provider'] = extract_service_provider(contract_text)
-    contract_data['Provider Address'] = extract_provider_address(contract_text)
-    contract_data['Provider Email'] = extract_provider_email(contract_text)
-    contract_data['Client Name'] = extract_client_name(contract_text)
-    contract_data['Client Address'] = extract_client_address(contract_text)
-    contract_data['Client Email'] = extract_client_email(contract_text)
-    contract_data['Service Description'] = extract_service_description(contract_text)
-    contract_data['Payment Amount'] = extract_payment_amount(contract_text)
-    contract_data['Payment Terms'] = extract_payment_terms(contract_text)
-    contract_data['Termination Conditions'] = extract_termination_conditions(contract_text)
-    contract_data['Governing Law'] = extract_governing_law(contract_text)
-    contract_data['Start Date'] = extract_start_date(contract_text)
-    contract_data['End Date'] = extract_end_date(contract_text)
-    contract_data['Contract Date'] = extract_contract_date(contract_text)
+    # Extract all fields in a single segmented pass
+    if guarded:
+        contract_data = extract_fields_guarded(contract_text, diagnostics=diagnostics, timings=timings, field_set=field_set)
+    else:
+        contract_data = extract_fields(contract_text, timings, field_set)
+    type_contract_dates(contract_data)
+    if timings is not None:
+        timings["total"] = time.perf_counter() - start
 
     # Return both contract_data and contract_text
     return contract_data, contract_text
+
+
+# Zip archives
+
+def iter_docx_members(zip_source):
+    """
+    Yields (member name, file bytes) for every .docx file in a zip archive,
+    including files in nested folders, without writing anything to disk.
+    Word lock files (~$...) and macOS resource forks are skipped.
+    """
+    with zipfile.ZipFile(zip_source) as archive:
+        for info in archive.infolist():
+            base_name = posixpath.basename(info.filename)
+            if info.is_dir() or not base_name.lower().endswith(".docx"):
+                continue
+            if base_name.startswith("~$") or info.filename.startswith("__MACOSX/"):
+                continue
+            yield info.filename, archive.read(info)
+
+
+# Batch extraction
+
+def _batch_payload(source):
+    # Uploaded files and other buffers are sent to the workers as plain bytes
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "read"):
+        return source.read()
+    return source
+
+
+def _read_bytes(payload):
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return bytes(payload)
+    with open(payload, "rb") as f:
+        return f.read()
+
+
+def _extract_one(source, profile=False, guarded=False, field_set=None):
+    # Returns (contract_data, contract_text, error, timings, diagnostics)
+    timings = {} if profile else None
+    diagnostics = []
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = BytesIO(source)
+        contract_data, contract_text = extract_contract_data(source, timings, guarded, diagnostics, field_set)
+        return contract_data, contract_text, None, timings, diagnostics
+    except Exception as e:
+        return None, None, str(e), timings, diagnostics
+
+
+def _read_one(source, profile=False):
+    # The reading half of _extract_one, plus the text's MinHash signature:
+    # returns (contract_text, error, timings, signature)
+    timings = {} if profile else None
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = BytesIO(source)
+        start = time.perf_counter()
+        contract_text = read_contract_file(source)
+        if timings is not None:
+            timings["read"] = time.perf_counter() - start
+            start = time.perf_counter()
+        # Hashed in the worker, so signatures are computed in parallel too
+        signature = minhash_signature(contract_text)
+        if timings is not None:
+            timings["signature"] = time.perf_counter() - start
+        return contract_text, None, timings, signature
+    except Exception as e:
+        return None, str(e), timings, None
+
+
+def _extract_text(contract_text, profile=False, guarded=False, field_set=None):
+    # The extraction half of _extract_one, for a text read by _read_one
+    timings = {} if profile else None
+    diagnostics = []
+    try:
+        if guarded:
+            contract_data = extract_fields_guarded(contract_text, diagnostics=diagnostics, timings=timings, field_set=field_set)
+        else:
+            contract_data = extract_fields(contract_text, timings, field_set)
+        return type_contract_dates(contract_data), contract_text, None, timings, diagnostics
+    except Exception as e:
+        return None, contract_text, str(e), timings, diagnostics
+
+
+def extract_many(sources, workers=None, chunksize=None, cache=None, profiler=None, names=None,
+                 guarded=False, diagnostics=None, seen=None, duplicates=None, field_set=None):
+    """
+    Extracts many contracts in parallel over a process pool.
+
+    sources may mix file paths, bytes and file-like objects (e.g. Streamlit
+    uploads). Returns one (contract_data, contract_text, error) tuple per
+    source, in input order. A document that fails to extract gets
+    (None, None, error message) instead of aborting the batch.
+
+    With an ExtractionCache, documents whose content is already cached are
+    not extracted again; their contract_text is None unless the cache
+    stores text.
+
+    With an instrumentation.ExtractionProfiler, the stage timings of every
+    extracted document are recorded in it under its entry in names (or its
+    position in sources).
+
+    With guarded=True, fields are extracted with extract_fields_guarded in
+    worker processes (even for a single worker), so a pathological document
+    cannot stall the batch. Messages about abandoned fields are logged and,
+    if a diagnostics dict is given, stored in it under the document's name.
+
+    With a contract_dedup.NearDuplicateIndex as seen, every document is
+    read and MinHashed before any fields are extracted. A document that
+    nearly duplicates one already in seen, or one earlier in sources, is
+    recorded in the duplicates dict (name -> content key of the earlier
+    contract) and gets (None, contract_text, None): its fields are not
+    extracted and nothing is cached for it. The others are added to seen
+    under their content key. Cached documents keep their cached fields, and
+    are only checked if the cache stores text.
+
+    field_set names the registered FieldSet to extract, for contracts from
+    another template variant; the standard template's by default. An
+    unknown name raises ValueError before any document is read.
+    """
+    get_field_set(field_set)
+    payloads = [_batch_payload(source) for source in sources]
+    results = [None] * len(payloads)
+
+    if cache is not None or seen is not None:
+        payloads = [_read_bytes(payload) for payload in payloads]
+
+    keys = None
+    if cache is not None:
+        keys = [cache.content_key(payload, field_set) for payload in payloads]
+        cached = cache.get_many(keys)
+        for index, key in enumerate(keys):
+            if key in cached:
+                contract_data, contract_text = cached[key]
+                # A copy each, since identical files share a cache entry and callers annotate the dicts
+                results[index] = (dict(contract_data), contract_text, None)
+
+    profile = profiler is not None
+    pending = [index for index, result in enumerate(results) if result is None]
+    read_timings = {}
+    with _worker_pool(workers, len(pending), guarded) as pool:
+        if seen is None:
+            extract = partial(_extract_one, profile=profile, guarded=guarded, field_set=field_set)
+            extracted = _map_pending(pool, extract, [payloads[index] for index in pending], chunksize)
+        else:
+            read = _map_pending(pool, partial(_read_one, profile=profile), [payloads[index] for index in pending], chunksize)
+            texts = {}
+            signatures = {}
+            for index, (contract_text, error, timings, signature) in zip(pending, read):
+                if error is not None:
+                    if profile:
+                        profiler.record(names[index] if names is not None else index, timings)
+                    results[index] = (None, None, error)
+                    continue
+                texts[index] = contract_text
+                signatures[index] = signature
+                read_timings[index] = timings
+            skipped = _check_near_duplicates(payloads, results, signatures, names, seen, duplicates)
+            pending = [index for index in texts if index not in skipped]
+            for index in skipped:
+                if index in texts:
+                    if profile:
+                        profiler.record(names[index] if names is not None else index, read_timings.pop(index))
+                    results[index] = (None, texts[index], None)
+            extract = partial(_extract_text, profile=profile, guarded=guarded, field_set=field_set)
+            extracted = _map_pending(pool, extract, [texts[index] for index in pending], chunksize)
+
+    new_entries = []
+    for index, (contract_data, contract_text, error, timings, messages) in zip(pending, extracted):
+        name = names[index] if names is not None else index
+        if profile:
+            # Read in a separate pass when checking for near-duplicates; one record per document
+            profiler.record(name, {**read_timings.get(index, {}), **timings})
+        if messages:
+            logger.warning("Guarded extraction of %s: %s", name, "; ".join(messages))
+            if diagnostics is not None:
+                diagnostics[name] = messages
+        results[index] = (contract_data, None if error else contract_text, error)
+        # Results with abandoned fields are not cached, so a later run can retry them
+        if keys is not None and error is None and not messages:
+            new_entries.append((keys[index], contract_data, contract_text))
+    if new_entries:
+        cache.put_many(new_entries)
+    return results
+
+
+def _check_near_duplicates(payloads, results, signatures, names, seen, duplicates):
+    # Checks the documents against seen in input order, so the first of a
+    # group of near-duplicates is the one kept. signatures holds those of
+    # the documents just read; cached results are hashed here. Returns the
+    # indexes of the near-duplicates.
+    skipped = set()
+    added = set()
+    for index, result in enumerate(results):
+        if index in signatures:
+            signature = signatures[index]
+        elif result is not None and result[2] is None:
+            signature = minhash_signature(result[1])
+        else:
+            continue
+        if signature is None:
+            continue
+        content_key = hashlib.sha256(payloads[index]).hexdigest()
+        match = seen.first_match(signature)
+        # Content seen in an earlier call is this document itself, not a duplicate of it
+        if match is not None and (match != content_key or content_key in added):
+            if duplicates is not None:
+                duplicates[names[index] if names is not None else index] = match
+            skipped.add(index)
+        else:
+            seen.add(content_key, signature)
+            added.add(content_key)
+    return skipped
+
+
+@contextmanager
+def _worker_pool(workers, count, guarded=False):
+    # Yields (pool, workers), with no pool when the work is done in this
+    # process. Guarded extraction needs a worker process, where it runs on
+    # the main thread and can interrupt a runaway pattern
+    workers = min(workers or os.cpu_count() or 1, count)
+    if workers < 1 or (workers == 1 and not guarded):
+        yield None, workers
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield pool, workers
+
+
+def _map_pending(pool, func, items, chunksize=None):
+    pool, workers = pool
+    if pool is None:
+        return [func(item) for item in items]
+    if chunksize is None:
+        # A few chunks per worker keeps them busy without per-document IPC
+        chunksize = max(1, len(items) // (workers * 4))
+    return list(pool.map(func, items, chunksize=chunksize))
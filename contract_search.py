@@ -0,0 +1,193 @@
+# contract_search.py
+import os
+import re
+import sqlite3
+
+from contract_dates import DATE_COLUMNS, parse_date
+from contract_loader import FIELD_NAMES
+
+DEFAULT_SEARCH_DIR = os.environ.get(
+    "CONTRACT_SEARCH_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".contract_search"),
+)
+
+# Text fields are searchable columns of the full-text index; dates are kept as ISO text for range filters
+TEXT_FIELDS = [field for field in FIELD_NAMES if field not in DATE_COLUMNS]
+_COLUMNS = {field: re.sub(r"\W+", "_", field.lower()) for field in (*FIELD_NAMES, "File Name")}
+_FTS_COLUMNS = [_COLUMNS["File Name"], *(_COLUMNS[field] for field in TEXT_FIELDS), "contract_text"]
+_SNIPPET_COLUMN = len(_FTS_COLUMNS) - 1
+
+_TERM_RE = re.compile(r'[^\s"]+\*?')
+# The tokenizer only indexes letters and digits, so a term without any can never match
+_WORD_CHAR_RE = re.compile(r"[^\W_]")
+
+
+def quote_terms(text):
+    """
+    Turns free text into an FTS5 query that matches documents containing
+    every word, with query syntax characters taken literally. A trailing *
+    keeps its meaning as a prefix search. Terms of punctuation alone are
+    dropped; returns None when no terms are left.
+    """
+    terms = []
+    for term in _TERM_RE.findall(text):
+        if not _WORD_CHAR_RE.search(term):
+            continue
+        if term.endswith("*"):
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    return " AND ".join(terms) if terms else None
+
+
+def _iso(value):
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed is not None else None
+
+
+class ContractSearchIndex:
+    """
+    Full-text and field search over extracted contracts, backed by SQLite
+    FTS5. The contract text and each text field are indexed as separate
+    columns, so queries can be restricted to a field and are ranked with
+    BM25; dates are filtered by range on an ordinary indexed table.
+    """
+
+    def __init__(self, search_dir=None):
+        self.search_dir = search_dir or DEFAULT_SEARCH_DIR
+        os.makedirs(self.search_dir, exist_ok=True)
+        self.db_path = os.path.join(self.search_dir, "search.sqlite3")
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS contracts (
+                    id INTEGER PRIMARY KEY,
+                    content_key TEXT UNIQUE NOT NULL,
+                    start_date TEXT,
+                    end_date TEXT,
+                    contract_date TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS contracts_end_date ON contracts (end_date)")
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5("
+                f"{', '.join(_FTS_COLUMNS)}, tokenize='porter unicode61')"
+            )
+
+    def _connect(self):
+        # One connection per call, like ExtractionCache, so the index can be shared across threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+
+    def add(self, entries):
+        """
+        Indexes (content_key, file_name, contract_data, contract_text)
+        entries; contract_text may be None. Contracts already indexed are
+        skipped. Returns the number added.
+        """
+        added = 0
+        placeholders = ", ".join("?" * (len(_FTS_COLUMNS) + 1))
+        with self._connect() as conn:
+            for content_key, file_name, contract_data, contract_text in entries:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO contracts (content_key, start_date, end_date, contract_date) VALUES (?, ?, ?, ?)",
+                    (
+                        content_key,
+                        _iso(contract_data.get("Start Date")),
+                        _iso(contract_data.get("End Date")),
+                        _iso(contract_data.get("Contract Date")),
+                    ),
+                )
+                if not cursor.rowcount:
+                    continue
+                fields = [None if contract_data.get(field) == "Missing" else contract_data.get(field) for field in TEXT_FIELDS]
+                conn.execute(
+                    f"INSERT INTO contracts_fts (rowid, {', '.join(_FTS_COLUMNS)}) VALUES ({placeholders})",
+                    (cursor.lastrowid, file_name, *fields, contract_text),
+                )
+                added += 1
+        return added
+
+    def remove(self, content_keys):
+        """Removes contracts from the index. Returns the number removed."""
+        removed = 0
+        with self._connect() as conn:
+            for content_key in content_keys:
+                row = conn.execute("SELECT id FROM contracts WHERE content_key = ?", (content_key,)).fetchone()
+                if row is None:
+                    continue
+                conn.execute("DELETE FROM contracts_fts WHERE rowid = ?", row)
+                conn.execute("DELETE FROM contracts WHERE id = ?", row)
+                removed += 1
+        return removed
+
+    def search(self, query="", fields=None, end_from=None, end_to=None, limit=50, raw=False):
+        """
+        Finds contracts, best match first.
+
+        query is matched against every indexed column and ranks the results
+        by BM25; with raw=True it is passed to FTS5 as is (phrases, OR, NEAR,
+        column filters). fields maps field names (e.g. "Governing Law") to
+        words that must all occur in that field. end_from and end_to bound
+        "End Date". Returns dicts with the content key, file name, text
+        fields, dates, and for a query the rank and a snippet of the
+        contract text around the matches.
+
+        A query or field words with nothing searchable in them (e.g. only
+        punctuation) are ignored; if that leaves no field words either,
+        nothing matches.
+        """
+        match = []
+        for field, words in (fields or {}).items():
+            terms = quote_terms(words) if words else None
+            if terms is not None:
+                match.append(f"{_COLUMNS[field]} : ({terms})")
+        ranked = False
+        if query and query.strip():
+            terms = query if raw else quote_terms(query)
+            if terms is not None:
+                match.insert(0, terms)
+                ranked = True
+            elif not match:
+                return []
+
+        conditions = []
+        params = []
+        if match:
+            conditions.append("contracts_fts MATCH ?")
+            params.append(" AND ".join(f"({part})" for part in match))
+        if end_from is not None:
+            conditions.append("c.end_date >= ?")
+            params.append(_iso(end_from))
+        if end_to is not None:
+            conditions.append("c.end_date <= ?")
+            params.append(_iso(end_to))
+
+        columns = ", ".join(f"contracts_fts.{column}" for column in _FTS_COLUMNS[:-1])
+        if ranked:
+            ranking = f"bm25(contracts_fts), snippet(contracts_fts, {_SNIPPET_COLUMN}, '**', '**', '…', 16)"
+            order = "bm25(contracts_fts)"
+        elif match:
+            # Nothing to rank by, and index order lets SQLite stop after `limit` matches
+            ranking = "NULL, NULL"
+            order = "contracts_fts.rowid"
+        else:
+            ranking = "NULL, NULL"
+            order = "c.end_date"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"SELECT c.content_key, {columns}, c.start_date, c.end_date, c.contract_date, {ranking} "
+            f"FROM contracts_fts JOIN contracts AS c ON c.id = contracts_fts.rowid "
+            f"{where} ORDER BY {order} LIMIT ?"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*params, limit)).fetchall()
+
+        names = ["Content Key", "File Name", *TEXT_FIELDS, *DATE_COLUMNS, "Rank", "Snippet"]
+        return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,308 @@
+# contract_watcher.py
+"""
+Keeps the contract index up to date with a directory tree of DOCX
+contracts, such as a shared archive.
+
+Run once, or keep rescanning every --interval seconds:
+    python contract_watcher.py generated_contracts
+    python contract_watcher.py /mnt/contracts --interval 60
+
+A scan only stats files. Files whose size or mtime changed since the last
+scan are read and hashed, and only those whose content changed are
+extracted, in batches, and added to the ContractIndex that the Contract
+Insights dashboard reads, and to the full-text search index. File states
+are kept in a SQLite manifest next to the index.
+
+With --skip-near-duplicates, a contract that nearly duplicates one already
+indexed (e.g. re-issued with another date) is recorded but not indexed.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from contract_dedup import NearDuplicateIndex
+from contract_index import ContractIndex
+from contract_loader import extract_many
+from contract_search import ContractSearchIndex
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_watch_manifest.sqlite3"
+
+
+def scan_tree(root):
+    """
+    Yields (path, size, mtime_ns) for every .docx file under root, using
+    directory entries and one stat per file. Word lock files (~$...) are
+    skipped.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            logger.warning("Cannot list %s: %s", directory, e)
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".docx") and not entry.name.startswith("~$") and entry.is_file():
+                        stat = entry.stat()
+                        yield entry.path, stat.st_size, stat.st_mtime_ns
+                except OSError:
+                    # Removed while scanning; the next scan settles it
+                    continue
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ContractWatcher:
+    """
+    Incrementally indexes the DOCX contracts under root into a
+    ContractIndex and, if given, a ContractSearchIndex. Rows of files that
+    were deleted, or whose content changed, are removed from the indexes
+    once no other file has that content.
+
+    With skip_near_duplicates, the MinHash signatures of indexed contracts
+    are kept in the manifest, and files that nearly duplicate an indexed
+    contract are recorded as duplicates instead of being indexed.
+    """
+
+    def __init__(self, root, index=None, cache=None, batch_size=256, workers=None, search_index=None,
+                 skip_near_duplicates=False):
+        self.root = os.path.abspath(root)
+        self.index = index if index is not None else ContractIndex()
+        self.search_index = search_index
+        self.skip_near_duplicates = skip_near_duplicates
+        self.cache = cache
+        self.batch_size = batch_size
+        self.workers = workers
+        self.manifest_path = os.path.join(self.index.index_dir, MANIFEST_NAME)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_key TEXT,
+                    error TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS files_content_key ON files (content_key)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signatures (
+                    content_key TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS near_duplicates (
+                    path TEXT PRIMARY KEY,
+                    original_key TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS near_duplicates_original ON near_duplicates (original_key)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.manifest_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _known_files(self, conn):
+        # Several roots may share one index, so only this root's files are loaded
+        prefix = os.path.join(self.root, "")
+        rows = conn.execute(
+            "SELECT path, size, mtime_ns, content_key FROM files WHERE substr(path, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+        return {path: (size, mtime_ns, content_key) for path, size, mtime_ns, content_key in rows}
+
+    def _load_signatures(self, conn):
+        seen = NearDuplicateIndex()
+        for content_key, signature in conn.execute("SELECT content_key, signature FROM signatures"):
+            seen.add(content_key, np.frombuffer(signature, dtype=np.uint32))
+        return seen
+
+    def scan(self):
+        """
+        Brings the index in line with the files under root. Returns counts
+        of scanned, changed, extracted, failed, near-duplicate and deleted
+        files plus the rows removed from the index.
+        """
+        start = time.perf_counter()
+        stats = {"scanned": 0, "changed": 0, "extracted": 0, "failed": 0, "near_duplicates": 0, "deleted": 0,
+                 "removed_rows": 0}
+        with self._connect() as conn:
+            known = self._known_files(conn)
+
+        changed = []
+        seen = set()
+        for path, size, mtime_ns in scan_tree(self.root):
+            seen.add(path)
+            state = known.get(path)
+            if state is None or state[0] != size or state[1] != mtime_ns:
+                changed.append((path, size, mtime_ns))
+        deleted = [path for path in known if path not in seen]
+        stats["scanned"] = len(seen)
+        stats["changed"] = len(changed)
+        stats["deleted"] = len(deleted)
+
+        # Content keys that may no longer belong to any file once this scan is done
+        stale_keys = {known[path][2] for path in deleted if known[path][2]}
+        seen_contracts = None
+        if self.skip_near_duplicates and changed:
+            with self._connect() as conn:
+                seen_contracts = self._load_signatures(conn)
+
+        for batch in _batches(changed, self.batch_size):
+            manifest_rows = []
+            to_extract = []
+            read = []
+            for path, size, mtime_ns in batch:
+                try:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                except OSError as e:
+                    logger.warning("Cannot read %s: %s", path, e)
+                    continue
+                read.append((path, size, mtime_ns, hashlib.sha256(content).hexdigest(), content))
+
+            # Earlier batches are already in the index, so asking about this batch's keys is enough
+            indexed_keys = self.index.existing_keys({content_key for *_, content_key, _ in read})
+            for path, size, mtime_ns, content_key, content in read:
+                previous_key = known.get(path, (None, None, None))[2]
+                if previous_key and previous_key != content_key:
+                    stale_keys.add(previous_key)
+                if content_key in indexed_keys:
+                    # Touched but unchanged, or a copy of an indexed contract
+                    manifest_rows.append((path, size, mtime_ns, content_key, None))
+                else:
+                    to_extract.append((path, size, mtime_ns, content_key, content))
+
+            records = []
+            search_entries = []
+            duplicates = {}
+            duplicate_rows = []
+            # Contracts not yet in the signature table, stored below if they turn out to be originals
+            new_keys = {key for *_, key, _ in to_extract if seen_contracts is not None and key not in seen_contracts}
+            if to_extract:
+                names = [os.path.relpath(path, self.root) for path, *_ in to_extract]
+                results = extract_many(
+                    [content for *_, content in to_extract],
+                    workers=self.workers,
+                    cache=self.cache,
+                    names=names,
+                    guarded=True,
+                    seen=seen_contracts,
+                    duplicates=duplicates,
+                )
+                for name, (path, size, mtime_ns, content_key, _), (contract_data, contract_text, error) in zip(
+                    names, to_extract, results
+                ):
+                    if error:
+                        logger.warning("Could not extract %s: %s", path, error)
+                        stats["failed"] += 1
+                        manifest_rows.append((path, size, mtime_ns, None, error))
+                        continue
+                    if name in duplicates:
+                        # Kept in the manifest so it is not extracted again until it changes
+                        logger.info("Skipping %s, a near-duplicate of %s", path, duplicates[name])
+                        stats["near_duplicates"] += 1
+                        manifest_rows.append((path, size, mtime_ns, content_key, None))
+                        duplicate_rows.append((path, duplicates[name]))
+                        continue
+                    contract_data["File Name"] = name
+                    contract_data["Content Key"] = content_key
+                    records.append(contract_data)
+                    search_entries.append((content_key, name, contract_data, contract_text))
+                    manifest_rows.append((path, size, mtime_ns, content_key, None))
+            stats["extracted"] += self.index.append(records)
+            if self.search_index is not None:
+                self.search_index.add(search_entries)
+
+            # Recorded after the rows are in the index, so an interrupted scan redoes this batch
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", manifest_rows)
+                conn.executemany("DELETE FROM near_duplicates WHERE path = ?", [(row[0],) for row in manifest_rows])
+                conn.executemany("INSERT INTO near_duplicates VALUES (?, ?)", duplicate_rows)
+                if seen_contracts is not None:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO signatures VALUES (?, ?)",
+                        [(key, seen_contracts.signature(key).tobytes()) for key in new_keys if key in seen_contracts],
+                    )
+
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in deleted])
+            conn.executemany("DELETE FROM near_duplicates WHERE path = ?", [(path,) for path in deleted])
+            orphaned = [
+                key for key in stale_keys
+                if conn.execute("SELECT 1 FROM files WHERE content_key = ? LIMIT 1", (key,)).fetchone() is None
+            ]
+            conn.executemany("DELETE FROM signatures WHERE content_key = ?", [(key,) for key in orphaned])
+            # Near-duplicates of a contract that left the index are examined again on the next scan
+            for key in orphaned:
+                conn.execute(
+                    "UPDATE files SET mtime_ns = -1 WHERE path IN (SELECT path FROM near_duplicates WHERE original_key = ?)",
+                    (key,),
+                )
+                conn.execute("DELETE FROM near_duplicates WHERE original_key = ?", (key,))
+        stats["removed_rows"] = self.index.remove(orphaned)
+        if self.search_index is not None:
+            self.search_index.remove(orphaned)
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        logger.info("Scanned %s: %s", self.root, stats)
+        return stats
+
+    def watch(self, interval):
+        """Rescans root every interval seconds until interrupted."""
+        while True:
+            self.scan()
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the DOCX contracts under a directory, extracting only new or changed files.")
+    parser.add_argument("root", help="Directory to scan")
+    parser.add_argument("--index-dir", help="Contract index directory (defaults to CONTRACT_INDEX_DIR or .contract_index)")
+    parser.add_argument("--interval", type=float, help="Keep rescanning every this many seconds")
+    parser.add_argument("--batch-size", type=int, default=256, help="Files extracted per batch")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction worker processes (defaults to CPU count)")
+    parser.add_argument("--search-dir", help="Search index directory (defaults to CONTRACT_SEARCH_DIR or .contract_search)")
+    parser.add_argument("--no-search", action="store_true", help="Do not update the full-text search index")
+    parser.add_argument("--skip-near-duplicates", action="store_true",
+                        help="Do not index contracts that nearly duplicate an indexed one")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    search_index = None if args.no_search else ContractSearchIndex(args.search_dir)
+    watcher = ContractWatcher(args.root, ContractIndex(args.index_dir), batch_size=args.batch_size, workers=args.workers,
+                              search_index=search_index, skip_near_duplicates=args.skip_near_duplicates)
+    if args.interval:
+        try:
+            watcher.watch(args.interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        watcher.scan()
+
+
+if __name__ == "__main__":
+    main()
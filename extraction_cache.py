@@ -0,0 +1,134 @@
+# extraction_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from contract_dates import dates_to_iso, type_contract_dates
+from contract_loader import DEFAULT_FIELD_SET, EXTRACTOR_VERSION
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "CONTRACT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".contract_cache"),
+)
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_BATCH = 500
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extract_contract_data results, keyed by the SHA-256 of
+    the file bytes plus the extractor version. Least recently used entries
+    are evicted once the cache exceeds max_entries or max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=100_000, max_bytes=1024 ** 3, store_text=False):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store_text = store_text
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.db_path = os.path.join(self.cache_dir, "extractions.sqlite3")
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    key TEXT PRIMARY KEY,
+                    contract_data TEXT NOT NULL,
+                    contract_text TEXT,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS extractions_last_used ON extractions (last_used)")
+
+    def _connect(self):
+        # One short-lived connection per call keeps the cache safe to share
+        # between Streamlit sessions, which run on different threads
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def content_key(content, field_set=None):
+        """
+        Returns the cache key for the raw bytes of a contract file, as
+        extracted with the named field set (the standard one by default).
+        """
+        digest = hashlib.sha256(content)
+        if field_set and field_set != DEFAULT_FIELD_SET:
+            return f"{EXTRACTOR_VERSION}/{field_set}:{digest.hexdigest()}"
+        return f"{EXTRACTOR_VERSION}:{digest.hexdigest()}"
+
+    def get_many(self, keys):
+        """
+        Looks up several keys at once. Returns a dict mapping each cached key
+        to its (contract_data, contract_text) pair; contract_text is None
+        unless the cache stores text.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._connect() as conn:
+            for i in range(0, len(keys), _QUERY_BATCH):
+                batch = keys[i:i + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, contract_data, contract_text FROM extractions WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, contract_data, contract_text in rows:
+                    found[key] = (type_contract_dates(json.loads(contract_data)), contract_text)
+                conn.execute(
+                    f"UPDATE extractions SET last_used = ? WHERE key IN ({placeholders})",
+                    [now, *batch],
+                )
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries):
+        """Stores (key, contract_data, contract_text) entries, then evicts."""
+        now = time.time()
+        rows = []
+        for key, contract_data, contract_text in entries:
+            contract_data = json.dumps(dates_to_iso(contract_data))
+            contract_text = contract_text if self.store_text else None
+            size = len(contract_data) + len(contract_text or "")
+            rows.append((key, contract_data, contract_text, size, now))
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict(conn)
+
+    def put(self, key, contract_data, contract_text=None):
+        self.put_many([(key, contract_data, contract_text)])
+
+    def _evict(self, conn):
+        conn.execute(
+            "DELETE FROM extractions WHERE key IN "
+            "(SELECT key FROM extractions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.execute(
+            "DELETE FROM extractions WHERE key IN "
+            "(SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running "
+            "FROM extractions) WHERE running > ?)",
+            (self.max_bytes,),
+        )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extractions")
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
@@ -0,0 +1,92 @@
+# instrumentation.py
+import bisect
+import json
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger("contract_pipeline.timings")
+
+# Upper bounds (in milliseconds) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+HISTOGRAM_LABELS = tuple(f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS) + (f">{HISTOGRAM_BOUNDS_MS[-1]}ms",)
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ExtractionProfiler:
+    """
+    Collects wall times per pipeline stage (document read, section
+    segmentation, each field extractor, validation), aggregates them into
+    histograms and flags documents whose total time exceeds budget_s.
+
+    Stages are recorded per document as a {stage: seconds} dict, such as
+    the one extract_contract_data fills when given timings={}.
+    """
+
+    def __init__(self, budget_s=None):
+        self.budget_s = budget_s
+        self._samples = defaultdict(list)
+        self._histograms = defaultdict(lambda: [0] * len(HISTOGRAM_LABELS))
+        self._document_totals = defaultdict(float)
+        self._document_stages = defaultdict(dict)
+
+    def record(self, document, timings):
+        for stage, seconds in timings.items():
+            self._samples[stage].append(seconds)
+            self._histograms[stage][bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+            self._document_stages[document][stage] = self._document_stages[document].get(stage, 0.0) + seconds
+        # "total" covers a whole extraction; stages timed outside it (e.g. validation) are added on top
+        self._document_totals[document] += timings.get("total", sum(
+            seconds for stage, seconds in timings.items() if stage != "total"
+        ))
+
+    def summary(self):
+        """Returns per-stage count, mean, p50, p99 and max in ms, plus the histogram."""
+        stages = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            stages[stage] = {
+                "count": len(ordered),
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p50_ms": _percentile(ordered, 0.50) * 1000,
+                "p99_ms": _percentile(ordered, 0.99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "histogram": dict(zip(HISTOGRAM_LABELS, self._histograms[stage])),
+            }
+        return stages
+
+    def slow_documents(self):
+        """
+        Returns the documents over budget, slowest first, as dicts with the
+        total time and the stage that took longest.
+        """
+        if self.budget_s is None:
+            return []
+        slow = []
+        for document, total in self._document_totals.items():
+            if total <= self.budget_s:
+                continue
+            stages = {stage: seconds for stage, seconds in self._document_stages[document].items() if stage != "total"}
+            slowest_stage = max(stages, key=stages.get) if stages else None
+            slow.append({
+                "document": document,
+                "total_ms": total * 1000,
+                "slowest_stage": slowest_stage,
+                "slowest_stage_ms": stages.get(slowest_stage, 0.0) * 1000,
+            })
+        return sorted(slow, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def log_summary(self):
+        """Emits the summary and the over-budget documents as one structured log line."""
+        payload = {
+            "event": "extraction_timings",
+            "documents": len(self._document_totals),
+            "budget_ms": self.budget_s * 1000 if self.budget_s is not None else None,
+            "stages": self.summary(),
+            "slow_documents": self.slow_documents(),
+        }
+        logger.info(json.dumps(payload, default=str))
+        return payload
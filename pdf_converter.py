@@ -0,0 +1,237 @@
+# pdf_converter.py
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SOFFICE = os.environ.get("CONTRACT_SOFFICE") or shutil.which("soffice") or shutil.which("libreoffice")
+DEFAULT_PDF_WORKERS = int(os.environ.get("CONTRACT_PDF_WORKERS", 2))
+
+# LibreOffice takes a few seconds to start, longer on a first run that creates its profile
+STARTUP_TIMEOUT_S = 60
+
+
+class ConverterUnavailable(RuntimeError):
+    pass
+
+
+def _uno():
+    # The uno module ships with LibreOffice (or python3-uno), so it is only needed for PDF output
+    try:
+        import uno
+        from com.sun.star.beans import PropertyValue
+        from com.sun.star.connection import NoConnectException
+    except ImportError as e:
+        raise ConverterUnavailable(
+            "PDF output needs LibreOffice's Python bridge (the uno module), e.g. the python3-uno package"
+        ) from e
+    return uno, PropertyValue, NoConnectException
+
+
+def _properties(**values):
+    _, PropertyValue, _ = _uno()
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+class _ConverterWorker:
+    """One headless LibreOffice process, kept running and driven over a UNO pipe."""
+
+    def __init__(self, soffice, work_dir):
+        self.pipe_name = f"contract_pdf_{uuid.uuid4().hex}"
+        # A profile per process, so the instances do not contend for one profile lock
+        self.profile_dir = os.path.join(work_dir, self.pipe_name)
+        self.process = subprocess.Popen(
+            [
+                soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={Path(self.profile_dir).as_uri()}",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.desktop = self._connect()
+        except BaseException:
+            self.close()
+            raise
+
+    def _connect(self):
+        uno, _, NoConnectException = _uno()
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT_S
+        while True:
+            if self.process.poll() is not None:
+                raise ConverterUnavailable(f"LibreOffice exited during startup with code {self.process.returncode}")
+            try:
+                context = resolver.resolve(f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext")
+                return context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+            except NoConnectException:
+                if time.monotonic() > deadline:
+                    raise ConverterUnavailable(f"LibreOffice did not start within {STARTUP_TIMEOUT_S}s")
+                time.sleep(0.1)
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def convert(self, docx_path, pdf_path):
+        document = self.desktop.loadComponentFromURL(Path(docx_path).as_uri(), "_blank", 0, _properties(Hidden=True))
+        try:
+            document.storeToURL(Path(pdf_path).as_uri(), _properties(FilterName="writer_pdf_Export"))
+        finally:
+            document.close(True)
+
+    def close(self):
+        try:
+            self.desktop.terminate()
+        except Exception:
+            # Not connected yet, or the bridge is gone
+            self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class PdfConverterPool:
+    """
+    Converts DOCX contracts to PDF with up to `size` headless LibreOffice
+    processes. Each process is started on first need and then kept warm for
+    later conversions; one that crashes is replaced. Safe to share between
+    threads.
+    """
+
+    def __init__(self, size=DEFAULT_PDF_WORKERS, soffice=None):
+        self.soffice = soffice or SOFFICE
+        if not self.soffice:
+            raise ConverterUnavailable("LibreOffice was not found; install it or set CONTRACT_SOFFICE")
+        _uno()
+        self.size = size
+        self._work_dir = tempfile.mkdtemp(prefix="contract_pdf_")
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise ConverterUnavailable("The converter pool is closed")
+                start_new = len(self._workers) < self.size
+                if start_new:
+                    # Reserve the slot; the worker is started outside the lock
+                    self._workers.append(None)
+            if start_new:
+                break
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                # Look again, a crashed worker may have freed its slot
+                continue
+        try:
+            worker = _ConverterWorker(self.soffice, self._work_dir)
+        except BaseException:
+            with self._lock:
+                self._workers.remove(None)
+            raise
+        with self._lock:
+            self._workers[self._workers.index(None)] = worker
+        return worker
+
+    def _discard(self, worker):
+        with self._lock:
+            self._workers.remove(worker)
+        worker.close()
+
+    def convert(self, content):
+        """Converts DOCX bytes (or a BytesIO) and returns the PDF bytes."""
+        if hasattr(content, "getvalue"):
+            content = content.getvalue()
+        job_dir = tempfile.mkdtemp(dir=self._work_dir)
+        try:
+            docx_path = os.path.join(job_dir, "contract.docx")
+            pdf_path = os.path.join(job_dir, "contract.pdf")
+            with open(docx_path, "wb") as f:
+                f.write(content)
+            for attempt in range(2):
+                worker = self._acquire()
+                try:
+                    worker.convert(docx_path, pdf_path)
+                except Exception:
+                    if worker.alive():
+                        # The document was at fault, the process is fine
+                        self._idle.put(worker)
+                        raise
+                    # A crashed process is replaced, and the document retried once
+                    self._discard(worker)
+                    if attempt == 0:
+                        continue
+                    raise
+                self._idle.put(worker)
+                break
+            with open(pdf_path, "rb") as f:
+                return f.read()
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+    def convert_many(self, contents):
+        """
+        Converts an iterable of DOCX documents and yields the PDFs in input
+        order, with a bounded number of documents in flight.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            pending = deque()
+            for content in contents:
+                pending.append(executor.submit(self.convert, content))
+                if len(pending) >= self.size * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = [worker for worker in self._workers if worker is not None]
+            self._workers = []
+        for worker in workers:
+            worker.close()
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
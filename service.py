@@ -0,0 +1,247 @@
+# service.py
+"""
+Headless HTTP service for contract extraction, validation and generation.
+
+Run with:
+    uvicorn service:app --host 0.0.0.0 --port 8000
+
+CPU-bound work (DOCX parsing, extraction, NER, rendering) runs in a bounded
+process pool. At most CONTRACT_SERVICE_MAX_IN_FLIGHT requests are processed
+at once and at most CONTRACT_SERVICE_MAX_QUEUED more may wait; beyond that
+the service answers 503 with a Retry-After header instead of queueing
+without limit.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from io import BytesIO
+
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from contract_dates import dates_to_iso
+from contract_loader import extract_contract_data
+from template_registry import TemplateRegistry
+from validation_checks import check_completeness, validate_contract_data
+
+WORKERS = int(os.environ.get("CONTRACT_SERVICE_WORKERS", os.cpu_count() or 1))
+MAX_IN_FLIGHT = int(os.environ.get("CONTRACT_SERVICE_MAX_IN_FLIGHT", WORKERS * 2))
+MAX_QUEUED = int(os.environ.get("CONTRACT_SERVICE_MAX_QUEUED", WORKERS * 8))
+MAX_UPLOAD_BYTES = int(os.environ.get("CONTRACT_SERVICE_MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
+# A request holds one limiter slot however many files it carries, so files per request are capped too
+MAX_FILES = int(os.environ.get("CONTRACT_SERVICE_MAX_FILES", 64))
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+template_path = os.path.join(current_dir, "templates", "Contract_template.docx")
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+# Work done in the pool processes
+
+_registry = None
+
+
+def _extract_document(content):
+    diagnostics = []
+    try:
+        contract_data, _ = extract_contract_data(BytesIO(content), guarded=True, diagnostics=diagnostics)
+        return {"contract_data": dates_to_iso(contract_data), "diagnostics": diagnostics, "error": None}
+    except Exception as e:
+        return {"contract_data": None, "diagnostics": diagnostics, "error": str(e)}
+
+
+def _render_contract(contract_data):
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry()
+    return _registry.render(template_path, contract_data).getvalue()
+
+
+# Concurrency control
+
+class Overloaded(Exception):
+    pass
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class ConcurrencyLimiter:
+    """Bounds in-flight requests and rejects new ones once the wait queue is full."""
+
+    def __init__(self, max_in_flight, max_queued):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._max_queued = max_queued
+        self._queued = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self._queued >= self._max_queued:
+            raise Overloaded()
+        self._queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+async def _run_in_pool(request, func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app.state.pool, func, *args)
+
+
+def _overloaded_response():
+    return JSONResponse({"error": "Service is at capacity, retry later"}, status_code=503, headers={"Retry-After": "1"})
+
+
+def _upload_size_error(request):
+    # An error response when Content-Length is malformed or over the limit, else None
+    length = request.headers.get("content-length")
+    if length is None:
+        return None
+    try:
+        length = int(length)
+    except ValueError:
+        return JSONResponse({"error": "Invalid Content-Length header"}, status_code=400)
+    if length > MAX_UPLOAD_BYTES:
+        return _upload_too_large_response()
+    return None
+
+
+def _limit_body(request, max_bytes):
+    # The same request, with a receive channel that raises UploadTooLarge
+    # once more than max_bytes of body have arrived. Catches chunked uploads,
+    # which have no Content-Length to check up front
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise UploadTooLarge()
+        return message
+
+    return Request(request.scope, receive)
+
+
+def _upload_too_large_response():
+    return JSONResponse({"error": f"Upload exceeds {MAX_UPLOAD_BYTES} bytes"}, status_code=413)
+
+
+async def _json_object(request):
+    # The request body if it is a JSON object, else None
+    try:
+        body = await request.json()
+    except ValueError:
+        # json.JSONDecodeError and UnicodeDecodeError are both ValueErrors
+        return None
+    return body if isinstance(body, dict) else None
+
+
+# Endpoints
+
+async def extract(request):
+    """POST multipart/form-data with one or more "files" fields holding DOCX contracts."""
+    error = _upload_size_error(request)
+    if error is not None:
+        return error
+    try:
+        async with request.app.state.limiter.slot():
+            # Starlette streams the multipart body into spooled temporary files
+            async with _limit_body(request, MAX_UPLOAD_BYTES).form() as form:
+                uploads = form.getlist("files")
+                if not uploads:
+                    return JSONResponse({"error": 'Expected one or more "files" fields'}, status_code=400)
+                if not all(isinstance(upload, UploadFile) for upload in uploads):
+                    return JSONResponse({"error": '"files" fields must be file uploads'}, status_code=400)
+                if len(uploads) > MAX_FILES:
+                    return JSONResponse({"error": f"At most {MAX_FILES} files per request"}, status_code=413)
+                contents = [(upload.filename, await upload.read()) for upload in uploads]
+            results = await asyncio.gather(
+                *(_run_in_pool(request, _extract_document, content) for _, content in contents)
+            )
+    except Overloaded:
+        return _overloaded_response()
+    except UploadTooLarge:
+        return _upload_too_large_response()
+    return JSONResponse([
+        {"file_name": file_name, **result} for (file_name, _), result in zip(contents, results)
+    ])
+
+
+async def validate(request):
+    """
+    POST JSON {"contract_data": {...}, "text": "..."}; the optional text is
+    checked for missing entities with spaCy.
+    """
+    body = await _json_object(request)
+    if body is None:
+        return JSONResponse({"error": "Expected a JSON object"}, status_code=400)
+    contract_data = body.get("contract_data")
+    if not isinstance(contract_data, dict):
+        return JSONResponse({"error": 'Expected a "contract_data" object'}, status_code=400)
+    text = body.get("text")
+    if text is not None and not isinstance(text, str):
+        return JSONResponse({"error": '"text" must be a string'}, status_code=400)
+    try:
+        async with request.app.state.limiter.slot():
+            response = {"issues": await _run_in_pool(request, validate_contract_data, contract_data)}
+            if text:
+                response["missing_entities"] = await _run_in_pool(request, check_completeness, text)
+    except Overloaded:
+        return _overloaded_response()
+    return JSONResponse(response)
+
+
+async def generate(request):
+    """POST JSON with the template's keys (contract_date, service_provider, ...); returns the DOCX."""
+    contract_data = await _json_object(request)
+    if contract_data is None:
+        return JSONResponse({"error": "Expected a JSON object"}, status_code=400)
+    try:
+        async with request.app.state.limiter.slot():
+            content = await _run_in_pool(request, _render_contract, contract_data)
+    except Overloaded:
+        return _overloaded_response()
+    return Response(
+        content,
+        media_type=DOCX_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="generated_contract.docx"'},
+    )
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.pool = ProcessPoolExecutor(max_workers=WORKERS)
+    app.state.limiter = ConcurrencyLimiter(MAX_IN_FLIGHT, MAX_QUEUED)
+    try:
+        yield
+    finally:
+        app.state.pool.shutdown(cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route("/extract", extract, methods=["POST"]),
+        Route("/validate", validate, methods=["POST"]),
+        Route("/generate", generate, methods=["POST"]),
+        Route("/health", health, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,118 @@
+# template_registry.py
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import islice
+
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+
+
+class _CompilingEnvironment(Environment):
+    """Jinja environment that compiles each distinct template source once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = super().from_string(source)
+            self._compiled[source] = template
+        return template
+
+
+class _LoadedTemplate:
+    def __init__(self, path):
+        self.mtime = os.stat(path).st_mtime_ns
+        with open(path, "rb") as f:
+            self.content = f.read()
+        self.jinja_env = _CompilingEnvironment()
+        self.patched_xml = {}
+
+
+class _RegistryDocxTemplate(DocxTemplate):
+    """DocxTemplate that reuses the XML clean-up done for earlier renders."""
+
+    def __init__(self, loaded):
+        super().__init__(BytesIO(loaded.content))
+        self._patched_xml = loaded.patched_xml
+
+    def patch_xml(self, src_xml):
+        patched = self._patched_xml.get(src_xml)
+        if patched is None:
+            patched = super().patch_xml(src_xml)
+            self._patched_xml[src_xml] = patched
+        return patched
+
+
+class TemplateRegistry:
+    """
+    Loads each contract template once per process and renders fresh copies
+    from memory. A template is reloaded when its file's mtime changes.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def _get(self, template_path):
+        template_path = os.path.abspath(template_path)
+        mtime = os.stat(template_path).st_mtime_ns
+        loaded = self._templates.get(template_path)
+        if loaded is None or loaded.mtime != mtime:
+            with self._lock:
+                loaded = self._templates.get(template_path)
+                if loaded is None or loaded.mtime != mtime:
+                    loaded = _LoadedTemplate(template_path)
+                    self._templates[template_path] = loaded
+        return loaded
+
+    def render(self, template_path, context):
+        """Renders the template with context and returns the DOCX as a BytesIO."""
+        loaded = self._get(template_path)
+        doc = _RegistryDocxTemplate(loaded)
+        doc.render(context, jinja_env=loaded.jinja_env)
+        doc_io = BytesIO()
+        doc.save(doc_io)
+        doc_io.seek(0)
+        return doc_io
+
+
+# Each worker process of render_many loads the template once and reuses it for every row
+_worker_registry = None
+_worker_template_path = None
+
+
+def _init_render_worker(template_path):
+    global _worker_registry, _worker_template_path
+    _worker_registry = TemplateRegistry()
+    _worker_template_path = template_path
+
+
+def _render_rows(jobs):
+    return [(index, _worker_registry.render(_worker_template_path, context).getvalue()) for index, context in jobs]
+
+
+def render_many(contexts, template_path, workers=None, chunksize=16):
+    """
+    Renders many contexts with the same template over a process pool and
+    yields (index, DOCX bytes) pairs in input order, as soon as each one is
+    ready. Only a few chunks per worker are in flight at a time, so a slow
+    consumer holds rendering back instead of letting documents pile up.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = enumerate(contexts)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker, initargs=(template_path,)) as pool:
+        pending = deque()
+        while chunk := list(islice(jobs, chunksize)):
+            pending.append(pool.submit(_render_rows, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
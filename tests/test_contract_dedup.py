@@ -0,0 +1,99 @@
+# test_contract_dedup.py
+import hashlib
+import os
+import re
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from contract_dedup import NearDuplicateIndex, find_near_duplicates, minhash_signature, similarity
+from contract_loader import extract_many, read_contract_file
+from extraction_cache import ExtractionCache
+from instrumentation import ExtractionProfiler
+
+CONTRACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated_contracts")
+
+
+def _docx(text):
+    document = Document()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def texts():
+    texts = {name: read_contract_file(os.path.join(CONTRACTS_DIR, f"generated_contract_{name}.docx")) for name in ("1", "3")}
+    # Contract 1 re-issued with another payment amount
+    texts["4"] = re.sub(r"amount of \$?\s*\d+", "amount of $123456", texts["1"], count=1)
+    assert texts["4"] != texts["1"]
+    return texts
+
+
+@pytest.fixture(scope="module")
+def contracts(texts):
+    return {name: _docx(text) for name, text in texts.items()}
+
+
+def test_signatures_estimate_similarity(texts):
+    assert similarity(minhash_signature(texts["1"]), minhash_signature(texts["4"])) >= 0.8
+    assert similarity(minhash_signature(texts["1"]), minhash_signature(texts["3"])) < 0.8
+    assert minhash_signature("") is None
+    assert find_near_duplicates(["1", "3", "4"], [texts["1"], texts["3"], texts["4"]]) == [["1", "4"]]
+
+
+def test_near_duplicates_across_calls(contracts):
+    seen = NearDuplicateIndex()
+    duplicates = {}
+    first = extract_many([contracts["1"]], workers=1, names=["1.docx"], seen=seen, duplicates=duplicates)
+    assert first[0][0]["Service Provider"] != "Missing"
+    assert duplicates == {}
+
+    # The same content again is not a duplicate of itself; the re-issue is
+    results = extract_many([contracts["1"], contracts["4"], contracts["3"]], workers=1,
+                           names=["1.docx", "4.docx", "3.docx"], seen=seen, duplicates=duplicates)
+    original_key = hashlib.sha256(contracts["1"]).hexdigest()
+    assert duplicates == {"4.docx": original_key}
+    assert results[0][0] is not None and results[2][0] is not None
+    # The near-duplicate is read but its fields are not extracted
+    contract_data, contract_text, error = results[1]
+    assert contract_data is None and contract_text and error is None
+
+    duplicates.clear()
+    extract_many([contracts["4"]], workers=1, names=["4.docx"], seen=seen, duplicates=duplicates)
+    assert duplicates == {"4.docx": original_key}
+    assert len(seen) == 2
+
+
+def test_near_duplicates_within_a_batch_are_not_cached(contracts, tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    duplicates = {}
+    results = extract_many([contracts["1"], contracts["1"], contracts["4"]], workers=1, cache=cache,
+                           names=["a", "b", "c"], seen=NearDuplicateIndex(), duplicates=duplicates)
+    assert set(duplicates) == {"b", "c"}
+    assert results[0][0] is not None
+    assert cache.stats()["entries"] == 1
+
+
+def test_profiler_records_each_document_once(contracts):
+    class CountingProfiler(ExtractionProfiler):
+        def __init__(self):
+            super().__init__()
+            self.recorded = []
+
+        def record(self, document, timings):
+            self.recorded.append((document, set(timings)))
+            super().record(document, timings)
+
+    profiler = CountingProfiler()
+    extract_many([contracts["1"], contracts["4"], b"not a docx"], workers=1, names=["1", "4", "bad"],
+                 profiler=profiler, seen=NearDuplicateIndex())
+    recorded = dict(profiler.recorded)
+    assert len(profiler.recorded) == len(recorded) == 3
+    # Read and extraction timings of an extracted document land in a single record
+    assert {"read", "signature", "segment"} <= recorded["1"]
+    assert recorded["4"] == {"read", "signature"}
+    assert profiler.summary()["read"]["count"] == 2
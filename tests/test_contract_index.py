@@ -0,0 +1,59 @@
+# test_contract_index.py
+from datetime import date
+
+import pytest
+
+from contract_index import ContractIndex
+
+TODAY = date(2025, 1, 1)
+
+
+def _record(key, end_date):
+    return {"Content Key": key, "File Name": f"{key}.docx", "Client Name": "Acme",
+            "Start Date": "January 1, 2024", "End Date": end_date}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ContractIndex(str(tmp_path))
+    index.append([
+        _record("expired", "December 1, 2024"),
+        _record("expiring", "January 20, 2025"),
+        _record("active", "June 1, 2026"),
+        _record("open-ended", "Missing"),
+    ])
+    return index
+
+
+def test_append_skips_indexed_content_keys(index):
+    assert index.existing_keys(["active", "new"]) == {"active"}
+    assert index.append([_record("active", "June 1, 2026"), _record("new", "June 1, 2026")]) == 1
+    assert index.append([_record("new", "June 1, 2026")]) == 0
+    assert len(index) == 5
+
+
+def test_append_keeps_records_without_content_key(index):
+    records = [_record(None, "June 1, 2026"), _record(None, "July 1, 2026"),
+               _record("new", "June 1, 2026"), _record("new", "June 1, 2026")]
+    assert index.append(records) == 3
+    assert index.append([_record(None, "June 1, 2026")]) == 1
+    loaded = index.load(columns=["Content Key"])
+    assert loaded["Content Key"].isna().sum() == 3
+    assert (loaded["Content Key"] == "new").sum() == 1
+
+
+def test_status_filters(index):
+    def keys(status):
+        return set(index.load(columns=["Content Key"], status=status, today=TODAY)["Content Key"])
+
+    assert keys("Expired") == {"expired"}
+    assert keys("Expiring Soon") == {"expiring"}
+    assert keys("Active") == {"active", "open-ended"}
+    assert keys(["Expired", "Expiring Soon"]) == {"expired", "expiring"}
+
+
+def test_end_date_filters(index):
+    loaded = index.load(columns=["Content Key"], end_from=date(2025, 1, 1), end_to=date(2025, 12, 31))
+    assert set(loaded["Content Key"]) == {"expiring"}
+    batches = list(index.iter_batches(columns=["Content Key"], end_from=date(2025, 1, 1), batch_size=1))
+    assert sorted(key for batch in batches for key in batch["Content Key"]) == ["active", "expiring"]
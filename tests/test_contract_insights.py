@@ -0,0 +1,87 @@
+# test_contract_insights.py
+import math
+import os
+from datetime import date
+
+from contract_index import ContractIndex
+from contract_insights import InsightsAggregator, build_insights_frame, stream_insights, summarize_insights
+from contract_loader import extract_many
+
+TODAY = date(2025, 1, 1)
+CONTRACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated_contracts")
+
+
+def _contract(start, end, client="Acme"):
+    return {"Service Provider": "Provider", "Client Name": client, "Start Date": start, "End Date": end}
+
+
+def test_empty_batch_is_ignored():
+    aggregator = InsightsAggregator(TODAY)
+    aggregator.update([])
+    aggregator.update([_contract("January 1, 2024", "March 1, 2025")])
+    aggregator.update([])
+    summary = aggregator.summary()
+    assert summary["total"] == 1
+    assert summary["active"] == 1
+
+
+def test_summary_of_no_contracts():
+    summary = InsightsAggregator(TODAY).summary()
+    assert summary["total"] == 0
+    assert math.isnan(summary["average_length"])
+    assert summarize_insights(build_insights_frame([], today=TODAY))["total"] == 0
+
+
+def test_batch_where_every_contract_failed():
+    results = extract_many([b"not a docx", b"PK\x03\x04 truncated"], workers=1)
+    assert all(error for _, _, error in results)
+    records = [contract_data for contract_data, _, error in results if not error]
+    aggregator = InsightsAggregator(TODAY)
+    aggregator.update(records)
+    assert aggregator.summary()["total"] == 0
+
+
+def test_aggregator_matches_summarize_insights():
+    contracts = [
+        _contract("January 1, 2024", "December 31, 2024"),
+        _contract("June 1, 2024", "January 20, 2025"),
+        _contract("March 3, 2024", "March 3, 2026", client=None),
+        _contract("Missing", "May 5, 2025"),
+    ]
+    aggregator = InsightsAggregator(TODAY)
+    aggregator.update_many(contracts, batch_size=3)
+    streamed = aggregator.summary()
+    expected = summarize_insights(build_insights_frame(contracts, today=TODAY))
+    for key in ("total", "active", "expiring", "with_issues", "average_length"):
+        assert streamed[key] == expected[key]
+    assert streamed["status_counts"].to_dict() == expected["status_counts"].to_dict()
+    assert [list(part) for part in streamed["length_histogram"]] == [list(part) for part in expected["length_histogram"]]
+
+
+def _docx_bytes(name):
+    with open(os.path.join(CONTRACTS_DIR, name), "rb") as f:
+        return f.read()
+
+
+def test_stream_insights_with_failed_batches(tmp_path):
+    index = ContractIndex(str(tmp_path / "index"))
+    contracts = [
+        ("broken.docx", b"not a docx"),
+        ("also-broken.docx", b"PK\x03\x04"),
+        ("generated_contract_1.docx", _docx_bytes("generated_contract_1.docx")),
+        ("generated_contract_3.docx", _docx_bytes("generated_contract_3.docx")),
+    ]
+    progress = []
+    summary, failed = stream_insights(contracts, index, today=TODAY, batch_size=2, progress=progress.append)
+    assert failed == ["broken.docx", "also-broken.docx"]
+    assert progress == [2, 4]
+    assert summary["total"] == 2
+    assert len(index) == 2
+
+    # Only failures: nothing to aggregate, but no error either
+    summary, failed = stream_insights(contracts[:2], index, today=TODAY)
+    assert summary["total"] == 0 and len(failed) == 2
+
+    # The archive holds the two contracts extracted above
+    summary, _ = stream_insights([], index, today=TODAY, include_archive=True, columns=["Start Date", "End Date"])
+    assert summary["total"] == 2
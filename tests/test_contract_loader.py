@@ -0,0 +1,436 @@
+# test_contract_loader.py
+import datetime
+import glob
+import os
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from io import BytesIO
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+import contract_loader
+from contract_loader import (
+    DEFAULT_FIELD_SET, FIELD_NAMES, FieldSet, FieldSpec, after_marker, cut_from, extract_field, extract_fields,
+    extract_fields_guarded, extract_many, get_field_set, iter_paragraph_text, read_contract_file,
+    register_field_set, segment_contract, strip_line_prefix,
+)
+from extraction_cache import ExtractionCache
+
+CONTRACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated_contracts")
+CONTRACT_PATHS = sorted(glob.glob(os.path.join(CONTRACTS_DIR, "*.docx")))
+
+HEADING_RE = re.compile(r"^\d+\.\s*(?:Services Provided|Payment Terms|Contract Duration|Termination|Confidentiality|Governing Law|Signatures)$", re.MULTILINE)
+
+
+# The extraction functions as they were before segmented extraction, one
+# whole-text search per field. extract_fields must give the same results.
+
+def legacy_service_provider(text):
+    match = re.search(r"Service Provider:\s*(.*?)\s*Address:", text, re.DOTALL)
+    return match.group(1).strip() if match and match.group(1).strip() != "" else "Missing"
+
+
+def legacy_provider_address(text):
+    match = re.search(r"Service Provider:\s*(?:.*?\s*)Address:\s*(.*?)(?=\s*Contact Email:|$)", text, re.DOTALL)
+    address = match.group(1).strip() if match else ""
+    return address if address else "Missing"
+
+
+def legacy_provider_email(text):
+    match = re.search(r"Contact Email:\s*(\S+@\S+\.\S+)", text)
+    email = match.group(1).strip() if match else ""
+    return email if email else "Missing"
+
+
+def legacy_client_email(text):
+    match = re.search(r"Client:.*?Contact Email:\s*(.*?)(?=\s*(?:\d\. Services Provided|$))", text, re.DOTALL)
+    email = match.group(1).strip() if match else ""
+    return email if email else "Missing"
+
+
+def legacy_client_name(text):
+    match = re.search(r"Client:\s*(.*?)\s*(?:Address:|Contact Email:|$)", text, re.DOTALL)
+    name = match.group(1).strip() if match else ""
+    return name if name else "Missing"
+
+
+def legacy_client_address(text):
+    match = re.search(r"Client:.*?Address:\s*(.*?)(?=\s*Contact Email:|$)", text, re.DOTALL)
+    address = match.group(1).strip() if match else ""
+    return address if address else "Missing"
+
+
+def legacy_service_description(text):
+    match = re.search(r"1\.\s*Services Provided\s*The Service Provider agrees to provide the following services to the Client:\s*(.*?)(?=2\.\s*Payment Terms|$)", text, re.DOTALL)
+    description = match.group(1).strip() if match else ""
+    return description if description else "Missing"
+
+
+def legacy_payment_amount(text):
+    match = re.search(r"amount of\s*\$?\s*(\d+(\.\d{2})?)", text)
+    amount = match.group(1).strip() if match else ""
+    return amount if amount else "Missing"
+
+
+def legacy_payment_terms(text):
+    match = re.search(r"2\.\s*Payment Terms\s*(.*?)(?=\n3\.\s*Contract Duration|$)", text, re.DOTALL)
+    terms = match.group(1).strip() if match else ""
+    if "payment schedule:" in terms:
+        terms = terms.split("payment schedule:")[1].strip()
+        terms = re.sub(r"\n3\..*", "", terms, flags=re.DOTALL).strip()
+    return terms if terms else "Missing"
+
+
+def legacy_termination_conditions(text):
+    match = re.search(r"4\.\s*Termination\s*(.*?)(?=5\.\s*Confidentiality|$)", text, re.DOTALL)
+    conditions = match.group(1).strip() if match else ""
+    if conditions:
+        conditions = conditions.split("conditions:")[-1].strip()
+        conditions = re.sub(r"\n5\..*", "", conditions, flags=re.DOTALL).strip()
+        conditions = re.sub(r"^-?\s*•?\s*", "", conditions, flags=re.MULTILINE).strip()
+    return conditions if conditions else "Missing"
+
+
+def legacy_governing_law(text):
+    match = re.search(r"6\.\s*Governing Law\s*This Agreement will be governed by and construed in accordance with the laws of\s*(.*?)(?=\n\d+\.\s|7\.\s*Signatures|$)", text, re.DOTALL)
+    law = match.group(1).strip() if match else ""
+    return law if law else "Missing"
+
+
+def legacy_start_date(text):
+    match = re.search(r"This Agreement will begin on (\w+ \d{1,2}, \d{4})", text)
+    return match.group(1).strip() if match else "Missing"
+
+
+def legacy_end_date(text):
+    match = re.search(r"will continue until (\w+ \d{1,2}, \d{4})", text)
+    return match.group(1).strip() if match else "Missing"
+
+
+def legacy_contract_date(text):
+    match = re.search(r"entered into on (\w+ \d{1,2}, \d{4})", text)
+    return match.group(1).strip() if match else "Missing"
+
+
+LEGACY_EXTRACTORS = {
+    "Service Provider": legacy_service_provider,
+    "Provider Address": legacy_provider_address,
+    "Provider Email": legacy_provider_email,
+    "Client Name": legacy_client_name,
+    "Client Address": legacy_client_address,
+    "Client Email": legacy_client_email,
+    "Service Description": legacy_service_description,
+    "Payment Amount": legacy_payment_amount,
+    "Payment Terms": legacy_payment_terms,
+    "Termination Conditions": legacy_termination_conditions,
+    "Governing Law": legacy_governing_law,
+    "Start Date": legacy_start_date,
+    "End Date": legacy_end_date,
+    "Contract Date": legacy_contract_date,
+}
+
+
+def legacy_fields(text):
+    return {field: extract(text) for field, extract in LEGACY_EXTRACTORS.items()}
+
+
+def split_sections(text):
+    """Returns the text before the first heading and the list of numbered sections."""
+    starts = [match.start() for match in HEADING_RE.finditer(text)]
+    assert starts, "no numbered headings in the contract"
+    bounds = starts + [len(text)]
+    return text[:starts[0]], [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _join(preamble, sections):
+    return preamble + "".join(section if section.endswith("\n") else section + "\n" for section in sections)
+
+
+@pytest.fixture(scope="module", params=[os.path.basename(path) for path in CONTRACT_PATHS])
+def contract_text(request):
+    return read_contract_file(os.path.join(CONTRACTS_DIR, request.param))
+
+
+def test_legacy_field_order():
+    assert tuple(LEGACY_EXTRACTORS) == FIELD_NAMES
+
+
+def test_matches_legacy_on_generated_contracts(contract_text):
+    assert extract_fields(contract_text) == legacy_fields(contract_text)
+
+
+def test_whole_text_functions_match_legacy(contract_text):
+    for field, extract in LEGACY_EXTRACTORS.items():
+        name = "extract_" + re.sub(r"\W+", "_", field.lower())
+        assert getattr(contract_loader, name)(contract_text) == extract(contract_text), field
+
+
+def test_matches_legacy_with_missing_sections(contract_text):
+    preamble, sections = split_sections(contract_text)
+    for index in range(len(sections)):
+        text = _join(preamble, sections[:index] + sections[index + 1:])
+        assert extract_fields(text) == legacy_fields(text), sections[index].splitlines()[0]
+
+
+def test_matches_legacy_without_preamble(contract_text):
+    _, sections = split_sections(contract_text)
+    text = _join("", sections)
+    assert extract_fields(text) == legacy_fields(text)
+
+
+@pytest.mark.parametrize("order", ["reversed", "rotated", "swapped"])
+def test_matches_legacy_with_out_of_order_headings(contract_text, order):
+    preamble, sections = split_sections(contract_text)
+    if order == "reversed":
+        sections = sections[::-1]
+    elif order == "rotated":
+        sections = sections[3:] + sections[:3]
+    else:
+        sections[1], sections[3] = sections[3], sections[1]
+    text = _join(preamble, sections)
+    assert extract_fields(text) == legacy_fields(text)
+
+
+def test_matches_legacy_with_renumbered_headings(contract_text):
+    # Headings whose numbers no longer match the template
+    text = HEADING_RE.sub(lambda match: "9. " + match.group(0).split(".", 1)[1].strip(), contract_text)
+    assert extract_fields(text) == legacy_fields(text)
+
+
+# Streaming reader
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx_bytes(document):
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _python_docx_text(data):
+    return "\n".join(paragraph.text for paragraph in Document(BytesIO(data)).paragraphs)
+
+
+def _run_with_text_nodes(paragraph, *texts):
+    # python-docx writes one w:t per run; Word often splits a run's text over several
+    run = paragraph.add_run()
+    for text in texts:
+        node = OxmlElement("w:t")
+        node.text = text
+        node.set(qn("xml:space"), "preserve")
+        run._r.append(node)
+    return run
+
+
+def _add_hyperlink(paragraph, text):
+    hyperlink = OxmlElement("w:hyperlink")
+    run = OxmlElement("w:r")
+    node = OxmlElement("w:t")
+    node.text = text
+    run.append(node)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+@pytest.fixture(scope="module")
+def awkward_docx():
+    document = Document()
+    document.add_paragraph("SERVICE AGREEMENT")
+    document.add_paragraph("Name:\tAlice\tJohnson")
+    paragraph = document.add_paragraph("Line one")
+    paragraph.add_run().add_break()
+    paragraph.add_run("Line two")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    paragraph.add_run("after the page break")
+    document.add_paragraph("")
+    document.add_paragraph()
+    _run_with_text_nodes(document.add_paragraph("Split: "), "XYZ Con", "sulting", " Services")
+    _add_hyperlink(document.add_paragraph("Contact Email: "), "contact@xyzconsulting.com")
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "table text, not a body paragraph"
+    document.add_paragraph("   leading and trailing spaces   ")
+    document.add_paragraph("")
+    return _docx_bytes(document)
+
+
+def test_iter_paragraph_text_matches_python_docx(awkward_docx):
+    paragraphs = list(iter_paragraph_text(BytesIO(awkward_docx)))
+    assert "\n".join(paragraphs) == _python_docx_text(awkward_docx)
+    assert paragraphs[1] == "Name:\tAlice\tJohnson"
+    assert paragraphs[2] == "Line one\nLine twoafter the page break"
+    assert paragraphs[3:5] == ["", ""]
+    assert paragraphs[5] == "Split: XYZ Consulting Services"
+
+
+def test_iter_paragraph_text_matches_python_docx_on_generated_contracts():
+    for path in CONTRACT_PATHS:
+        with open(path, "rb") as file:
+            data = file.read()
+        assert "\n".join(iter_paragraph_text(BytesIO(data))) == _python_docx_text(data), path
+
+
+def _move_main_part(data, name):
+    # Same package with the main part stored under another name, found only through the relationships
+    source = zipfile.ZipFile(BytesIO(data))
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename in ("[Content_Types].xml", "_rels/.rels"):
+                content = content.replace(b"word/document.xml", name.encode())
+            filename = {"word/document.xml": name,
+                        "word/_rels/document.xml.rels": posixpath.join("word/_rels", posixpath.basename(name) + ".rels")}
+            target.writestr(filename.get(item.filename, item.filename), content)
+    return buffer.getvalue()
+
+
+def test_read_contract_file_falls_back_without_word_document_xml(awkward_docx):
+    data = _move_main_part(awkward_docx, "word/main.xml")
+    with pytest.raises(KeyError):
+        list(iter_paragraph_text(BytesIO(data)))
+    # The buffer has been partly read when the fallback rewinds it
+    assert read_contract_file(BytesIO(data)) == _python_docx_text(awkward_docx)
+
+
+def test_read_contract_file_falls_back_on_parse_error(monkeypatch, awkward_docx, tmp_path):
+    def broken(source):
+        if hasattr(source, "read"):
+            source.read(10)
+        raise ET.ParseError("not well-formed")
+        yield
+
+    monkeypatch.setattr(contract_loader, "iter_paragraph_text", broken)
+    path = tmp_path / "contract.docx"
+    path.write_bytes(awkward_docx)
+    expected = _python_docx_text(awkward_docx)
+    assert read_contract_file(BytesIO(awkward_docx)) == expected
+    assert read_contract_file(str(path)) == expected
+
+
+# Field registry
+
+LEASE_TEXT = """RESIDENTIAL LEASE
+This Lease is entered into on March 01, 2025.
+1. Parties
+Landlord: Bob Smith
+Tenant: Carol White
+2. Rent
+The Tenant will pay a monthly rent of $1200.
+- Due on the first of each month
+- Paid by bank transfer
+3. Term
+The lease ends on February 28, 2026.
+"""
+
+# Registered at import, so extract_many's forked workers know it too
+LEASE = register_field_set(FieldSet(
+    "test-lease",
+    headings=(
+        ("parties", 1, "Parties"),
+        ("rent", 2, "Rent"),
+        ("term", 3, "Term"),
+    ),
+    fields=(
+        FieldSpec("Tenant", "parties", r"Tenant:\s*(.*)"),
+        FieldSpec("Monthly Rent", "rent", r"monthly rent of\s*\$?(\d+)"),
+        FieldSpec("Rent Rules", "rent", r"2\.\s*Rent\s*(.*?)(?=\n3\.|$)", re.DOTALL,
+                  steps=(after_marker("."), strip_line_prefix(r"-\s*"), cut_from(r"\nPaid"))),
+        FieldSpec("Landlord", "term", r"Landlord:\s*(.*)"),
+        FieldSpec("End Date", "term", r"ends on (\w+ \d{1,2}, \d{4})"),
+        FieldSpec("Deposit", "rent", r"deposit of\s*\$?(\d+)"),
+    ),
+))
+
+LEASE_FIELDS = {
+    "Tenant": "Carol White",
+    "Monthly Rent": "1200",
+    "Rent Rules": "Due on the first of each month",
+    # Not in its section: found in the whole text instead
+    "Landlord": "Bob Smith",
+    "End Date": "February 28, 2026",
+    "Deposit": "Missing",
+}
+
+
+def _lease_docx():
+    return _docx_bytes(_document(LEASE_TEXT))
+
+
+def _document(text):
+    document = Document()
+    for paragraph in text.rstrip("\n").split("\n"):
+        document.add_paragraph(paragraph)
+    return document
+
+
+def test_registered_field_set_is_found_by_name():
+    assert get_field_set("test-lease") is LEASE
+    assert get_field_set() is get_field_set(DEFAULT_FIELD_SET)
+    assert LEASE.section_order == ("preamble", "parties", "rent", "term")
+    assert LEASE.field_names == tuple(LEASE_FIELDS)
+
+
+def test_field_set_segments_its_own_headings():
+    spans = segment_contract(LEASE_TEXT, field_set="test-lease")
+    assert LEASE_TEXT[slice(*spans["preamble"])].startswith("RESIDENTIAL LEASE")
+    assert LEASE_TEXT[slice(*spans["rent"])].startswith("2. Rent")
+    assert LEASE_TEXT[slice(*spans["term"])].startswith("3. Term")
+    assert segment_contract("1. Parties\nTenant: x", field_set="test-lease")["rent"] is None
+
+
+def test_extract_fields_with_custom_field_set():
+    assert extract_fields(LEASE_TEXT, field_set="test-lease") == LEASE_FIELDS
+    assert extract_field(LEASE_TEXT, "Monthly Rent", field_set="test-lease") == "1200"
+    timings = {}
+    extract_fields(LEASE_TEXT, timings, field_set="test-lease")
+    assert set(timings) == {"segment", *(f"field:{field}" for field in LEASE_FIELDS)}
+
+
+def test_extract_fields_guarded_with_custom_field_set():
+    assert extract_fields_guarded(LEASE_TEXT, field_set="test-lease") == LEASE_FIELDS
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_extract_many_with_custom_field_set(workers):
+    results = extract_many([_lease_docx(), _lease_docx()], workers=workers, field_set="test-lease")
+    for contract_data, contract_text, error in results:
+        assert error is None
+        assert contract_text == LEASE_TEXT.rstrip("\n")
+        assert contract_data == {**LEASE_FIELDS, "End Date": datetime.date(2026, 2, 28)}
+
+
+def test_extract_many_caches_field_sets_apart(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    data = _lease_docx()
+    lease, = extract_many([data], workers=1, cache=cache, field_set="test-lease")
+    standard, = extract_many([data], workers=1, cache=cache)
+    assert lease[0]["Tenant"] == "Carol White"
+    assert "Tenant" not in standard[0]
+    assert standard[0]["Service Provider"] == "Missing"
+
+
+def test_unknown_field_set_raises():
+    with pytest.raises(ValueError, match="Unknown field set: nope"):
+        extract_fields(LEASE_TEXT, field_set="nope")
+    with pytest.raises(ValueError, match="Unknown field set: nope"):
+        extract_many([_lease_docx()], workers=1, field_set="nope")
+
+
+def test_field_in_unknown_section_is_rejected():
+    with pytest.raises(ValueError, match="unknown sections: rent"):
+        FieldSet("broken", headings=(("parties", 1, "Parties"),), fields=(FieldSpec("Rent", "rent", r"rent (\d+)"),))
+
+
+def test_register_field_set_replaces_by_name():
+    try:
+        replacement = register_field_set(FieldSet("test-lease", LEASE.headings, LEASE.fields[:1]))
+        assert get_field_set("test-lease") is replacement
+        assert extract_fields(LEASE_TEXT, field_set="test-lease") == {"Tenant": "Carol White"}
+    finally:
+        register_field_set(LEASE)
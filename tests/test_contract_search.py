@@ -0,0 +1,87 @@
+# test_contract_search.py
+from datetime import date
+
+import pytest
+
+from contract_search import ContractSearchIndex, quote_terms
+
+
+def _entry(key, client, law, end_date, text):
+    contract_data = {"Client Name": client, "Governing Law": law, "End Date": end_date,
+                     "Start Date": "January 1, 2024", "Service Description": "Missing"}
+    return key, f"{key}.docx", contract_data, text
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ContractSearchIndex(str(tmp_path))
+    index.add([
+        _entry("alice", "Alice Johnson", "State of California, USA", "November 15, 2025",
+               "IT consulting to streamline workflow automation. Payment of $7500."),
+        _entry("bob", "Bob Smith", "State of New York, USA", "March 1, 2026",
+               "Marketing services for the product launch."),
+        _entry("carol", "Carol White", "State of California, USA", date(2024, 6, 30),
+               "Consultancy on data migration, with a C++ code review."),
+    ])
+    return index
+
+
+def _keys(results):
+    return [result["Content Key"] for result in results]
+
+
+def test_quote_terms():
+    assert quote_terms("consulting services") == '"consulting" AND "services"'
+    assert quote_terms("consult*") == '"consult"*'
+    assert quote_terms('NEAR(a b) OR "c') == '"NEAR(a" AND "b)" AND "OR" AND "c"'
+    assert quote_terms("C++ - review !!") == '"C++" AND "review"'
+
+
+@pytest.mark.parametrize("text", ["", "   ", "!!!", "- * ...", "*", '"" ---'])
+def test_quote_terms_without_terms(text):
+    assert quote_terms(text) is None
+
+
+def test_search_ranks_query_matches(index):
+    results = index.search("workflow")
+    assert _keys(results) == ["alice"]
+    assert "**workflow**" in results[0]["Snippet"]
+    assert set(_keys(index.search("consult*"))) == {"alice", "carol"}
+    assert _keys(index.search("consulting migration")) == ["carol"]
+    assert _keys(index.search("california automation")) == ["alice"]
+
+
+def test_search_ignores_punctuation_terms(index):
+    assert _keys(index.search("launch !!")) == ["bob"]
+    assert _keys(index.search("C++ review")) == ["carol"]
+
+
+def test_search_with_punctuation_only_query_matches_nothing(index):
+    assert index.search("!!!") == []
+    assert index.search("*", end_from=date(2020, 1, 1)) == []
+
+
+def test_search_with_punctuation_only_query_applies_field_filters(index):
+    results = index.search("- ...", fields={"Governing Law": "california"})
+    assert set(_keys(results)) == {"alice", "carol"}
+    assert all(result["Rank"] is None for result in results)
+    assert set(_keys(index.search("", fields={"Governing Law": "california", "Client Name": "?"}))) == {"alice", "carol"}
+
+
+def test_search_by_field_and_end_date(index):
+    assert _keys(index.search(fields={"Client Name": "bob"})) == ["bob"]
+    assert _keys(index.search(fields={"Governing Law": "california"}, end_from=date(2025, 1, 1))) == ["alice"]
+    assert _keys(index.search(end_to=date(2025, 12, 31))) == ["carol", "alice"]
+
+
+def test_raw_query(index):
+    assert set(_keys(index.search("marketing OR migration", raw=True))) == {"bob", "carol"}
+    assert _keys(index.search("governing_law : york", raw=True)) == ["bob"]
+
+
+def test_add_skips_indexed_and_remove(index):
+    assert index.add([_entry("bob", "Bob Smith", "", "March 1, 2026", "again")]) == 0
+    assert len(index) == 3
+    assert index.remove(["bob", "unknown"]) == 1
+    assert index.search("marketing") == []
+    assert len(index) == 2
@@ -0,0 +1,45 @@
+# test_contract_watcher.py
+import os
+import shutil
+
+import pytest
+
+from contract_index import ContractIndex
+from contract_watcher import ContractWatcher
+
+CONTRACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generated_contracts")
+
+
+@pytest.fixture
+def watched(tmp_path):
+    root = tmp_path / "contracts"
+    root.mkdir()
+    for number in (1, 2, 3):
+        shutil.copy(os.path.join(CONTRACTS_DIR, f"generated_contract_{number}.docx"), root)
+    index = ContractIndex(str(tmp_path / "index"))
+    # Scanning must not load every indexed key
+    index.content_keys = None
+    return root, ContractWatcher(str(root), index, batch_size=2, workers=1)
+
+
+def test_scan_extracts_each_content_once(watched):
+    root, watcher = watched
+    stats = watcher.scan()
+    assert (stats["changed"], stats["extracted"], stats["failed"]) == (3, 3, 0)
+
+    # A copy of an indexed contract, in a later batch than the original, is not extracted again
+    (root / "nested").mkdir()
+    shutil.copy(root / "generated_contract_1.docx", root / "nested" / "copy.docx")
+    os.utime(root / "generated_contract_2.docx", ns=(0, 0))
+    stats = watcher.scan()
+    assert (stats["changed"], stats["extracted"]) == (2, 0)
+    assert len(watcher.index) == 3
+
+
+def test_scan_removes_rows_of_deleted_files(watched):
+    root, watcher = watched
+    watcher.scan()
+    os.remove(root / "generated_contract_3.docx")
+    stats = watcher.scan()
+    assert (stats["deleted"], stats["removed_rows"]) == (1, 1)
+    assert len(watcher.index) == 2
@@ -0,0 +1,83 @@
+# test_service.py
+import pytest
+from starlette.testclient import TestClient
+
+import service
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(service.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("path", ["/validate", "/generate"])
+@pytest.mark.parametrize("body", [b"{not json", b"[1, 2]", b'"text"', b"\xff\xfe"])
+def test_malformed_json_body_is_rejected(client, path, body):
+    response = client.post(path, content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+@pytest.mark.parametrize("body", [{}, {"contract_data": None}, {"contract_data": ["a"]}])
+def test_validate_needs_a_contract_data_object(client, body):
+    assert client.post("/validate", json=body).status_code == 400
+
+
+def test_validate_rejects_non_string_text(client):
+    response = client.post("/validate", json={"contract_data": {}, "text": 5})
+    assert response.status_code == 400
+
+
+def test_validate_reports_issues(client):
+    contract_data = {"Client Name": "Acme", "Start Date": "May 1, 2025", "End Date": "January 1, 2025"}
+    response = client.post("/validate", json={"contract_data": contract_data})
+    assert response.status_code == 200
+    issues = response.json()["issues"]
+    assert "Missing service provider" in issues["Missing Fields"]
+    assert "End date must be after start date" in issues["Date Problems"]
+
+
+def test_non_numeric_content_length_is_rejected(client):
+    response = client.post("/extract", content=b"x", headers={"Content-Length": "lots"})
+    assert response.status_code == 400
+
+
+def _multipart(files, boundary="contract-boundary"):
+    parts = []
+    for file_name, content in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="files"; filename="{file_name}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n".encode() + content + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def test_chunked_upload_over_the_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(service, "MAX_UPLOAD_BYTES", 1000)
+    body, content_type = _multipart([("big.docx", b"x" * 5000)])
+    # A generator body is sent chunked, without a Content-Length
+    chunks = (body[start:start + 256] for start in range(0, len(body), 256))
+    response = client.post("/extract", content=chunks, headers={"Content-Type": content_type})
+    assert response.status_code == 413
+
+
+def test_text_files_field_is_rejected(client):
+    response = client.post("/extract", data={"files": "hello"})
+    assert response.status_code == 400
+
+
+def test_too_many_files_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(service, "MAX_FILES", 2)
+    body, content_type = _multipart([(f"{number}.docx", b"x") for number in range(3)])
+    response = client.post("/extract", content=body, headers={"Content-Type": content_type})
+    assert response.status_code == 413
+
+
+def test_extract_reports_unreadable_files(client):
+    body, content_type = _multipart([("broken.docx", b"not a docx")])
+    response = client.post("/extract", content=body, headers={"Content-Type": content_type})
+    assert response.status_code == 200
+    [result] = response.json()
+    assert result["file_name"] == "broken.docx" and result["error"]
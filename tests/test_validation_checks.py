@@ -0,0 +1,46 @@
+# test_validation_checks.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from contract_dates import parse_contract_dates
+from contract_loader import FIELD_NAMES
+from validation_checks import _contract_issues, issue_messages, validate_contract_data, validate_contracts
+
+TODAY = datetime(2025, 1, 1, 12)
+
+
+def _contract(**dates):
+    contract_data = {field: "value" for field in FIELD_NAMES}
+    contract_data.update({"Start Date": "January 1, 2024", "End Date": "June 1, 2026", "Contract Date": "December 1, 2023"})
+    contract_data.update({field.replace("_", " ").title(): value for field, value in dates.items()})
+    return contract_data
+
+
+CASES = [
+    _contract(),
+    _contract(end_date="January 15, 2025"),
+    _contract(end_date="December 1, 2024"),
+    _contract(start_date="May 1, 2025", end_date="February 1, 2025"),
+    _contract(start_date="Missing", end_date=""),
+    _contract(start_date="not a date", contract_date="February 30, 2024"),
+    _contract(start_date=date(2024, 3, 1), end_date=datetime(2025, 1, 10)),
+    _contract(start_date="January 1, 1500", end_date="December 31, 9999"),
+    _contract(start_date="2024-02-01", end_date=None),
+    {"Client Name": "Acme"},
+]
+
+
+@pytest.mark.parametrize("contract_data", CASES)
+def test_single_contract_matches_batch_validation(contract_data):
+    expected = issue_messages(validate_contracts([contract_data], today=TODAY).iloc[0])
+    assert issue_messages(_contract_issues(contract_data, TODAY)) == expected
+
+
+def test_valid_contract():
+    end_date = (date.today() + timedelta(days=365)).strftime("%B %d, %Y")
+    assert validate_contract_data(_contract(end_date=end_date)) == {"Complete and Valid": ["Contract is complete and valid."]}
+
+
+def test_dates_outside_timestamp_range_are_invalid():
+    assert parse_contract_dates(["January 1, 1500", "May 1, 2024"]).isna().tolist() == [True, False]
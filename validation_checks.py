@@ -1,84 +1,140 @@
 # validation_checks.py
-import spacy
-from datetime import datetime, timedelta
-from dateutil import parser
+from datetime import datetime
+from functools import lru_cache
+import pandas as pd
+from contract_dates import DATE_COLUMNS, MISSING_VALUES, parse_contract_dates, parse_date, parse_timestamp
+from contract_insights import EXPIRY_WINDOW, contract_status
+from contract_loader import FIELD_NAMES
 
-nlp = spacy.load("en_core_web_sm")
+# Only the entity recognizer is needed. In en_core_web_sm it has its own
+# token-to-vector layer, so the shared tok2vec and the other components are
+# left out of the pipeline entirely.
+_UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+@lru_cache(maxsize=None)
+def get_nlp():
+    """
+    Loads the spaCy model on first use, once per process, with only the
+    NER component.
+    """
+    import spacy
+    return spacy.load("en_core_web_sm", exclude=_UNUSED_PIPES)
+
+def __getattr__(name):
+    # Keeps `validation_checks.nlp` working without loading the model at import
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Per-contract checks, in the order they are reported
+ISSUE_COLUMNS = ["Missing Fields", "Invalid Dates", "Date Problems", "Expiring Soon", "Expired"]
+
+def _join_flagged(mask):
+    # Joins the names of the flagged columns per row, e.g. "Client Name, End Date"
+    names = pd.Index(mask.columns).astype(str) + ", "
+    return mask.dot(names).str[:-2].where(mask.any(axis=1), "")
+
+def validate_contracts(contracts, today=None):
+    """
+    Validates a batch of extracted contracts (a dataframe, or a list of
+    dicts, keyed by contract_loader.FIELD_NAMES) in vectorized form.
+
+    Returns one row per contract, on the input's index, with the missing
+    fields and unparseable dates (comma-separated names), whether the end
+    date is before the start date, whether the contract expires within 30
+    days or has expired, and "Complete and Valid" when none of these apply.
+    """
+    df = pd.DataFrame(contracts).reindex(columns=list(FIELD_NAMES))
+    missing = df.isna() | df.isin(["", "Missing"])
+
+    dates = pd.DataFrame({column: parse_contract_dates(df[column]) for column in DATE_COLUMNS}, index=df.index)
+    invalid_dates = dates.isna() & ~missing[DATE_COLUMNS]
+    status = contract_status(dates["End Date"], today)
+
+    issues = pd.DataFrame(index=df.index)
+    issues["Missing Fields"] = _join_flagged(missing)
+    issues["Invalid Dates"] = _join_flagged(invalid_dates)
+    issues["Date Problems"] = (dates["Start Date"] > dates["End Date"]).to_numpy()
+    issues["Expiring Soon"] = (status == "Expiring Soon").to_numpy()
+    issues["Expired"] = ((status == "Expired") & dates["End Date"].notna()).to_numpy()
+    issues["Complete and Valid"] = ~(
+        missing.any(axis=1) | invalid_dates.any(axis=1)
+        | issues["Date Problems"] | issues["Expiring Soon"] | issues["Expired"]
+    )
+    return issues
+
+def issue_messages(issues_row):
+    """
+    Turns one row of validate_contracts output into the {category:
+    [messages]} form shown in the app.
+    """
+    messages = {}
+    if issues_row["Missing Fields"]:
+        messages["Missing Fields"] = [f"Missing {name.lower()}" for name in issues_row["Missing Fields"].split(", ")]
+    date_problems = []
+    if issues_row["Invalid Dates"]:
+        date_problems.extend(f"Invalid date format: {name}" for name in issues_row["Invalid Dates"].split(", "))
+    if issues_row["Date Problems"]:
+        date_problems.append("End date must be after start date")
+    if date_problems:
+        messages["Date Problems"] = date_problems
+    if issues_row["Expiring Soon"]:
+        messages["Expiring Soon"] = ["Contract expires within 30 days"]
+    if issues_row["Expired"]:
+        messages["Expired"] = ["Contract has expired"]
+    if not messages:
+        messages["Complete and Valid"] = ["Contract is complete and valid."]
+    return messages
+
+def _is_missing(value):
+    # NaN and NaT are the only values not equal to themselves
+    return value is None or value != value or (isinstance(value, str) and value in MISSING_VALUES)
+
+def _contract_issues(contract_data, today=None):
+    # validate_contracts for a single dict, without building dataframes
+    missing = [field for field in FIELD_NAMES if _is_missing(contract_data.get(field))]
+    dates = {column: parse_timestamp(contract_data.get(column)) for column in DATE_COLUMNS}
+    invalid_dates = [column for column in DATE_COLUMNS if dates[column] is None and column not in missing]
+    start, end = dates["Start Date"], dates["End Date"]
+    today = pd.Timestamp(today if today is not None else datetime.today())
+    return {
+        "Missing Fields": ", ".join(missing),
+        "Invalid Dates": ", ".join(invalid_dates),
+        "Date Problems": start is not None and end is not None and start > end,
+        "Expiring Soon": end is not None and today <= end <= today + EXPIRY_WINDOW,
+        "Expired": end is not None and end < today,
+    }
 
 def validate_contract_data(contract_data):
     """Validate contract data"""
-    issues = {}
-    
-    # Ensure we have a tuple with the right number of elements
-    expected_fields = 7
-    if len(contract_data) != expected_fields:
-        issues["Missing Fields"] = [f"Contract data is incomplete. Expected {expected_fields} fields, got {len(contract_data)}"]
-        return issues
-    
-    # Unpack tuple values only if we have the right number of elements
-    try:
-        client_name, project_name, start_date, end_date, contract_value, payment_terms, scope_of_work = contract_data
-        
-        # Rest of your validation logic remains the same
-        if not all([client_name, project_name, start_date, end_date, contract_value, payment_terms, scope_of_work]):
-            issues["Missing Fields"] = []
-            if not client_name:
-                issues["Missing Fields"].append("Missing client name")
-            if not project_name:
-                issues["Missing Fields"].append("Missing project name")
-            if not start_date:
-                issues["Missing Fields"].append("Missing start date")
-            if not end_date:
-                issues["Missing Fields"].append("Missing end date")
-            if not contract_value:
-                issues["Missing Fields"].append("Missing contract value")
-            if not payment_terms:
-                issues["Missing Fields"].append("Missing payment terms")
-            if not scope_of_work:
-                issues["Missing Fields"].append("Missing scope of work")
-        
-        # Validate dates
-        try:
-            start_date = parser.parse(str(start_date))
-            end_date = parser.parse(str(end_date))
-            
-            if start_date > end_date:
-                issues["Date Problems"] = ["End date must be after start date"]
-            
-            # Check if contract is expiring soon (within 30 days)
-            if end_date - datetime.now() <= timedelta(days=30):
-                issues["Expiring Soon"] = ["Contract expires within 30 days"]
-                
-        except (ValueError, TypeError):
-            issues["Date Problems"] = ["Invalid date format"]
-            
-        if not issues:
-            issues["Complete and Valid"] = ["Contract is complete and valid."]
-            
-    except Exception as e:
-        issues["Error"] = [f"Error validating contract: {str(e)}"]
-    
-    return issues
+    return issue_messages(_contract_issues(contract_data))
 
 def validate_date(date_str):
     """
     Validates whether the provided date string is in a proper date format.
     """
-    try:
-        parser.parse(date_str)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return parse_date(date_str) is not None
+
+EXPECTED_ENTITIES = {"DATE", "PERSON", "ORG", "GPE"}
+
+def _missing_entities(doc):
+    found_entities = {ent.label_ for ent in doc.ents}
+
+    # Check if required entities are present
+    missing_entities = EXPECTED_ENTITIES - found_entities
+    return list(missing_entities)
 
 def check_completeness(text):
     """
     Uses spaCy to analyze the text for entities to assess 
     whether key details are included.
     """
-    doc = nlp(text)
-    expected_entities = {"DATE", "PERSON", "ORG", "GPE"}
-    found_entities = {ent.label_ for ent in doc.ents}
+    return _missing_entities(get_nlp()(text))
 
-    # Check if required entities are present
-    missing_entities = expected_entities - found_entities
-    return list(missing_entities)
+def check_completeness_many(texts, batch_size=32, n_process=1):
+    """
+    Batch version of check_completeness built on nlp.pipe. Returns the
+    missing entity labels for each text, in input order.
+    """
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_missing_entities(doc) for doc in docs]